@@ -1,9 +1,11 @@
 import os
 import asyncio
+import queue
+import threading
 import streamlit as st
 from pathlib import Path
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import plotly.express as px
 from dotenv import load_dotenv
 import json
@@ -16,6 +18,15 @@ from resume_parser import (
     save_resume_data,
     calculate_candidate_score
 )
+from resume_parser.cache import ResultCache, SQLiteResultCache
+from resume_parser.document_splitter import ResumeSplitter
+from resume_parser.headers import load_header_profiles
+from resume_parser.manifest import DONE, FAILED
+from resume_parser.models import HeaderProfile
+from resume_parser.pipeline import PipelineResult, iter_in_thread, run_pipeline
+from resume_parser.prompts import PROMPT_VERSION
+from resume_parser.store import CohortStore
+from resume_parser.writer import ResultWriter
 
 # Load environment variables
 load_dotenv()
@@ -58,6 +69,26 @@ if 'parsed_resume' not in st.session_state:
     st.session_state.parsed_resume = None
 if 'current_tab' not in st.session_state:
     st.session_state.current_tab = "Upload"
+if 'bulk_results' not in st.session_state:
+    st.session_state.bulk_results = {}
+if 'bulk_rows' not in st.session_state:
+    st.session_state.bulk_rows = []
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start one long-lived event loop for all parsing work.
+    
+    The parser's pooled HTTP connections belong to the loop they were opened
+    on, so every request must run on the same loop instead of a fresh
+    asyncio.run() per upload.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
 
 @st.cache_resource
 def get_parser():
@@ -67,48 +98,101 @@ def get_parser():
         base_url=os.getenv('DEEPSEEK_URL')
     )
 
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Open the persistent result cache shared by all sessions and app processes."""
+    return SQLiteResultCache(
+        os.getenv('RESULT_CACHE_PATH', 'data/result_cache.sqlite3'),
+        max_bytes=int(float(os.getenv('RESULT_CACHE_MAX_MB', 512)) * 1024 * 1024),
+        max_age=float(os.getenv('RESULT_CACHE_MAX_AGE_DAYS', 30)) * 24 * 3600
+    )
+
+@st.cache_resource
+def get_header_profiles() -> Optional[List[HeaderProfile]]:
+    """Institution headers compiled PDFs are split at; NITK unless HEADER_PROFILES names a JSON file."""
+    path = os.getenv('HEADER_PROFILES')
+    return load_header_profiles(path) if path else None
+
+@st.cache_resource
+def get_parse_locks() -> List[threading.Lock]:
+    """Locks striped by cache key, so concurrent uploads of a file parse it once.
+    
+    The set is fixed, so memory does not grow with every file ever uploaded;
+    two different files rarely share a stripe and then merely parse in turn.
+    """
+    return [threading.Lock() for _ in range(64)]
+
+@st.cache_resource
+def get_cohort_store() -> CohortStore:
+    """Open the cohort tables shared by every session of this process.
+    
+    Part files are numbered from those on disk when a store is opened, so a
+    store per bulk run would let concurrent runs overwrite each other's parts.
+    """
+    return CohortStore(Path("data") / "cohort")
+
+def result_cache_key(file_content: bytes) -> str:
+    """Cache key of an uploaded file for the current model and prompt."""
+    return get_result_cache().key(file_content, get_parser().model, PROMPT_VERSION)
+
+def with_scores(data: Dict) -> Dict:
+    """Recompute the scores of a cached result, so weight changes apply to it."""
+    resume_info, extra_info = reconstruct_resume_info(data)
+    data['tokens']['scores'] = calculate_candidate_score(resume_info, extra_info)
+    return data
+
+def to_dict(resume_info: ResumeInfo, extra_info: ExtraCurricular, token_usage, scores: Dict) -> Dict:
+    """Convert a parsed resume to a plain dictionary for caching."""
+    resume_dict = resume_info.model_dump()
+    extra_dict = extra_info.model_dump()
+    token_dict = {
+        'completion_tokens': token_usage.completion_tokens,
+        'prompt_tokens': token_usage.prompt_tokens,
+        'total_tokens': token_usage.total_tokens,
+        'cached_tokens': token_usage.cached_tokens,
+        'scores': scores  # Add scores to response
+    }
+    
+    return {
+        'resume': resume_dict,
+        'extra': extra_dict,
+        'tokens': token_dict
+    }
+
 # Create async function for parsing
-async def async_parse_resume(file_content: bytes, file_name: str) -> Optional[Dict]:
-    """Async function to parse resume."""
-    temp_file = "temp_resume.pdf"
-    with open(temp_file, "wb") as f:
-        f.write(file_content)
+async def async_parse_resume(parser: ResumeParser, file_content: bytes, file_name: str) -> Dict:
+    """Async function to parse resume.
     
-    try:
-        parser = get_parser()
-        resume_info, extra_info, token_usage = await parser.parse_resume(temp_file)
-        
-        # Calculate scores
-        scores = calculate_candidate_score(resume_info, extra_info)
-        
-        # Convert to dictionary for caching
-        resume_dict = resume_info.model_dump()
-        extra_dict = extra_info.model_dump()
-        token_dict = {
-            'completion_tokens': token_usage.completion_tokens,
-            'prompt_tokens': token_usage.prompt_tokens,
-            'total_tokens': token_usage.total_tokens,
-            'cached_tokens': token_usage.cached_tokens,
-            'scores': scores  # Add scores to response
-        }
-        
-        return {
-            'resume': resume_dict,
-            'extra': extra_dict,
-            'tokens': token_dict
-        }
-    except Exception as e:
-        st.error(f"Error parsing resume: {str(e)}")
-        return None
-    finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+    The upload is parsed from memory, so concurrent sessions never share a file.
+    """
+    resume_info, extra_info, token_usage = await parser.parse_resume(file_content, Path(file_name).stem)
+    
+    # Calculate scores
+    scores = calculate_candidate_score(resume_info, extra_info)
+    
+    return to_dict(resume_info, extra_info, token_usage, scores)
 
 # Wrapper function for caching
-@st.cache_data
 def parse_resume_to_dict(file_content: bytes, file_name: str) -> Optional[Dict]:
-    """Cached wrapper for resume parsing."""
-    return asyncio.run(async_parse_resume(file_content, file_name))
+    """Parse an upload, serving repeated uploads from the persistent result cache.
+    
+    Concurrent uploads of the same file in this process wait for the first
+    parse instead of paying for a second LLM call.
+    """
+    cache = get_result_cache()
+    key = result_cache_key(file_content)
+    locks = get_parse_locks()
+    with locks[int(key[:8], 16) % len(locks)]:
+        cached = cache.get(key)
+        if cached is not None:
+            return with_scores(cached)
+        try:
+            parsed_data = run_async(async_parse_resume(get_parser(), file_content, file_name))
+        except Exception as e:
+            st.error(f"Error parsing resume: {str(e)}")
+            return None
+        cache.put(key, parsed_data)
+        return parsed_data
 
 def reconstruct_resume_info(data: Dict) -> Tuple[ResumeInfo, ExtraCurricular]:
     """Reconstruct ResumeInfo and ExtraCurricular from dictionary."""
@@ -125,6 +209,15 @@ def display_token_usage(token_data: Dict):
     - Total Tokens: {token_data['total_tokens']}
     """)
 
+def display_cache_stats():
+    """Display hit/miss counts of the shared result cache."""
+    stats = get_result_cache().stats()
+    st.sidebar.markdown("### Result Cache")
+    st.sidebar.markdown(f"""
+    - Hits: {stats['hits']} / Misses: {stats['misses']} ({stats['hit_ratio']:.0%} hit ratio)
+    - Entries: {stats['entries']} ({stats['bytes'] / 1024 / 1024:.1f} MB, {stats['evictions']} evicted)
+    """)
+
 def display_metadata(metadata, scores):
     """Display student metadata and scores in a formatted way."""
     col1, col2 = st.columns(2)
@@ -421,12 +514,178 @@ def display_extra_curricular(extra):
     else:
         st.info("No extra-curricular activities found.")
 
+def display_resume(resume: ResumeInfo, extra: ExtraCurricular, scores: Dict):
+    """Display all sections of a parsed resume."""
+    display_metadata(resume.metadata, scores)
+    st.markdown("---")
+    
+    display_academic_performance(resume.academic_performance)
+    st.markdown("---")
+    
+    display_technical_skills(resume.technical_skills)
+    st.markdown("---")
+    
+    display_projects(resume.projects)
+    st.markdown("---")
+    
+    display_extra_curricular(extra)
+
+def iter_uploaded_resumes(files: List[Tuple[str, bytes]], compiled: bool,
+                          parser: ResumeParser) -> Iterator[Tuple[str, str]]:
+    """Yield (filename, text) for every resume in the uploaded files.
+    
+    Compiled PDFs are split into resumes with ResumeSplitter; other files
+    are treated as one resume each. Runs on the pipeline's source thread.
+    """
+    for file_name, file_content in files:
+        if not compiled:
+            yield file_name, "\n".join(parser.text_extractor.extract(file_content))
+            continue
+        
+        splitter = ResumeSplitter(file_content, text_extractor=parser.text_extractor,
+                                  profiles=get_header_profiles())
+        yield from splitter.iter_resumes()
+
+def stream_bulk_results(files: List[Tuple[str, bytes]], compiled: bool,
+                        concurrency: int) -> Iterator[PipelineResult]:
+    """Parse uploaded resumes concurrently, yielding each result as it finishes.
+    
+    The pipeline runs on the shared event loop with at most ``concurrency``
+    resumes in flight; results are handed to the Streamlit script thread
+    through a queue. Parsed data is written to ``data/parsed_data`` like a
+    single upload, and to the cohort tables in ``data/cohort``.
+    """
+    results: queue.Queue = queue.Queue()
+    
+    async def produce():
+        parser = get_parser()
+        writer = ResultWriter(
+            get_cohort_store(),
+            csv_output_dir=Path("data"),
+            raw_response_dir=None  # saved by the parser
+        )
+        try:
+            resumes = iter_in_thread(iter_uploaded_resumes(files, compiled, parser))
+            async for result in run_pipeline(resumes, parser, writer, concurrency=concurrency):
+                results.put(result)
+        finally:
+            await writer.close()
+            results.put(None)
+    
+    future = asyncio.run_coroutine_threadsafe(produce(), get_event_loop())
+    try:
+        while (result := results.get()) is not None:
+            yield result
+        future.result()  # re-raise a failure of the PDF source
+    finally:
+        # A consumer that stops early (e.g. a Streamlit rerun) must not leave
+        # the pipeline making LLM calls; a no-op once produce() has finished
+        future.cancel()
+
+def leaderboard_row(source_id: str, status: str, parsed_data: Optional[Dict] = None,
+                    error: Optional[str] = None) -> Dict:
+    """One leaderboard row for a parsed (or failed) resume."""
+    row = {'Source': source_id, 'Status': status}
+    if parsed_data is not None:
+        metadata = parsed_data['resume']['metadata']
+        scores = parsed_data['tokens']['scores']
+        row.update({
+            'Reg. No.': metadata['reg_no'],
+            'Name': metadata['name'],
+            'Branch': metadata['branch'],
+            'Total': scores['total_score'],
+            'Academic': scores['academic_score'],
+            'Technical': scores['technical_score'],
+            'Projects': scores['projects_score'],
+            'Extra-curricular': scores['extra_score'],
+            'Tokens': parsed_data['tokens']['total_tokens']
+        })
+    if error:
+        row['Error'] = error
+    return row
+
+def display_leaderboard(rows: List[Dict], placeholder):
+    """Render the leaderboard, best candidate first; columns sort on click."""
+    df = pd.DataFrame(rows)
+    if 'Total' in df:
+        df = df.sort_values('Total', ascending=False, na_position='last')
+    placeholder.dataframe(df, use_container_width=True, hide_index=True)
+
+def bulk_mode():
+    """Screen many resumes at once and rank them on a live leaderboard."""
+    uploaded_files = st.sidebar.file_uploader("Choose PDF files", type="pdf", accept_multiple_files=True)
+    compiled = st.sidebar.checkbox(
+        "Files are compiled PDFs",
+        help="Split each file into resumes at the institute header instead of treating it as one resume"
+    )
+    concurrency = st.sidebar.slider("Resumes parsed at once", min_value=1, max_value=32, value=8)
+    
+    if not uploaded_files:
+        st.info("👈 Upload resume PDFs (or compiled PDFs) to screen a cohort!")
+        return
+    
+    if st.sidebar.button("Parse all", type="primary"):
+        st.session_state.bulk_results = {}
+        rows = []
+        progress = st.progress(0.0, text="Starting...")
+        leaderboard = st.empty()
+        
+        # Files parsed before (on any replica sharing the cache) are not sent again
+        cache = get_result_cache()
+        files = []
+        keys = {}
+        for uploaded_file in uploaded_files:
+            file_content = uploaded_file.getvalue()
+            source_id = Path(uploaded_file.name).stem
+            cached = None
+            if not compiled:
+                keys[source_id] = result_cache_key(file_content)
+                cached = cache.get(keys[source_id])
+            if cached is None:
+                files.append((uploaded_file.name, file_content))
+                continue
+            st.session_state.bulk_results[source_id] = with_scores(cached)
+            rows.append(leaderboard_row(source_id, "cached", st.session_state.bulk_results[source_id]))
+        display_leaderboard(rows, leaderboard)
+        expected = None if compiled else len(uploaded_files)
+        
+        for result in stream_bulk_results(files, compiled, concurrency):
+            parsed_data = None
+            if result.status == DONE:
+                parsed_data = to_dict(result.resume_info, result.extra_info, result.token_usage, result.scores)
+                st.session_state.bulk_results[result.source_id] = parsed_data
+                if result.source_id in keys:
+                    cache.put(keys[result.source_id], parsed_data)
+            rows.append(leaderboard_row(result.source_id, result.status, parsed_data, result.error))
+            failed = sum(row['Status'] == FAILED for row in rows)
+            status = f"{len(rows)} parsed ({failed} failed), latest: {result.source_id}"
+            progress.progress(len(rows) / expected if expected else 0.0, text=status)
+            display_leaderboard(rows, leaderboard)
+        
+        progress.progress(1.0, text=f"Done: {len(rows)} resumes")
+        st.session_state.bulk_rows = rows
+        display_cache_stats()
+    elif st.session_state.bulk_rows:
+        display_leaderboard(st.session_state.bulk_rows, st.empty())
+    
+    if st.session_state.bulk_results:
+        st.markdown("---")
+        source_id = st.selectbox("Candidate details", list(st.session_state.bulk_results))
+        parsed_data = st.session_state.bulk_results[source_id]
+        resume, extra = reconstruct_resume_info(parsed_data)
+        display_resume(resume, extra, parsed_data['tokens']['scores'])
+
 def main():
     """Main Streamlit application."""
     st.title("📄 Resume Parser")
     
     # Sidebar
     st.sidebar.title("Upload Resume")
+    mode = st.sidebar.radio("Mode", ["Single resume", "Bulk screening"], horizontal=True)
+    if mode == "Bulk screening":
+        bulk_mode()
+        return
+    
     uploaded_file = st.sidebar.file_uploader("Choose a PDF file", type="pdf")
     
     if uploaded_file:
@@ -443,6 +702,7 @@ def main():
                 
                 # Display token usage
                 display_token_usage(parsed_data['tokens'])
+                display_cache_stats()
                 
                 # Display parsed information
                 st.success("Resume parsed successfully!")
@@ -472,19 +732,7 @@ def main():
                     )
                 
                 # Display sections
-                display_metadata(resume.metadata, parsed_data['tokens']['scores'])
-                st.markdown("---")
-                
-                display_academic_performance(resume.academic_performance)
-                st.markdown("---")
-                
-                display_technical_skills(resume.technical_skills)
-                st.markdown("---")
-                
-                display_projects(resume.projects)
-                st.markdown("---")
-                
-                display_extra_curricular(extra)
+                display_resume(resume, extra, parsed_data['tokens']['scores'])
     else:
         st.info("👈 Upload a resume PDF to get started!")
 
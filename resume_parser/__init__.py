@@ -2,6 +2,7 @@ from .utils import TokenUsage, save_resume_data, calculate_candidate_score
 from .parser import ResumeParser
 from .models import ResumeInfo, ExtraCurricular
 from .extractor import ExtraCurricularExtractor
+from .scoring import Cohort, score_cohort
 
 __all__ = [
     'TokenUsage',
@@ -10,5 +11,7 @@ __all__ = [
     'ResumeParser',
     'ResumeInfo',
     'ExtraCurricular',
-    'ExtraCurricularExtractor'
+    'ExtraCurricularExtractor',
+    'Cohort',
+    'score_cohort'
 ] 
\ No newline at end of file
@@ -0,0 +1,218 @@
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
+
+from .models import ResumeInfo
+from .text_extraction import normalize_text
+
+# Changes whenever a field is added, removed or re-described in ResumeInfo
+SCHEMA_VERSION = hashlib.sha256(
+    json.dumps(ResumeInfo.model_json_schema(), sort_keys=True).encode()
+).hexdigest()[:16]
+
+
+class ExtractionCache:
+    """Persistent cache of LLM extraction results, addressed by content hash.
+
+    Entries are keyed by a hash of the normalised resume text, the model name,
+    the prompt and the ResumeInfo schema version, so any change to one of them
+    misses the cache instead of returning a stale result.
+    """
+
+    def __init__(self, cache_dir: str = "data/llm_cache"):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached extraction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str, model: str, prompt: str) -> str:
+        """Return the content hash for an extraction request."""
+        payload = json.dumps([SCHEMA_VERSION, model, prompt, normalize_text(text).strip()])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[ResumeInfo]:
+        """Return the cached ResumeInfo for ``key``, or None on a miss."""
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            resume_info = ResumeInfo.model_validate(entry["response"])
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return resume_info
+
+    def put(self, key: str, resume_info: ResumeInfo, model: str):
+        """Store an extraction result; concurrent writers never see partial files."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "model": model,
+                "schema_version": SCHEMA_VERSION,
+                "response": resume_info.model_dump()
+            }, f)
+        os.replace(tmp_path, path)
+
+
+class ResultCache(ABC):
+    """Cache of complete parse results for uploaded files.
+
+    Entries are keyed by a hash of the file content, the model, the prompt
+    and the ResumeInfo schema version, and hold the JSON-serialisable result
+    shown to the user. Subclasses provide the storage; hits and misses are
+    counted here.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, content: bytes, model: str, prompt: str) -> str:
+        """Return the content hash for an uploaded file."""
+        digest = hashlib.sha256(content).hexdigest()
+        payload = json.dumps([SCHEMA_VERSION, model, prompt, digest])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for ``key``, or None on a miss."""
+        result = self._get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    @abstractmethod
+    def put(self, key: str, result: Dict):
+        """Store a result, evicting old entries if the cache is over its limits."""
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Dict]:
+        """Return the stored result for ``key``, or None if absent or expired."""
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SQLiteResultCache(ResultCache):
+    """Result cache in a local SQLite database.
+
+    The database survives restarts and can be shared by every app process
+    on the host (or replicas mounting the same local volume; SQLite locking
+    is not reliable over network file systems). Entries older than
+    ``max_age`` seconds expire, and once the stored results exceed
+    ``max_bytes`` the least recently used ones are evicted. Hit, miss and
+    eviction counts are also kept in the database, so ``stats()`` covers
+    all processes using it.
+    """
+
+    def __init__(self, path: str = "data/result_cache.sqlite3", max_bytes: Optional[int] = 512 * 1024 * 1024,
+                 max_age: Optional[float] = 30 * 24 * 3600):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file, created if missing
+            max_bytes: Maximum total size of the stored results, unlimited if None
+            max_age: Seconds after which an entry expires, never if None
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as db, db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)")
+            db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            db.executemany(
+                "INSERT OR IGNORE INTO counters VALUES (?, 0)",
+                [("hits",), ("misses",), ("evictions",)]
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per operation, so the cache can be used from any thread
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    def _count(self, db: sqlite3.Connection, name: str, amount: int = 1):
+        db.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def _get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            row = db.execute("SELECT value, created_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.max_age is not None and now - row[1] > self.max_age:
+                db.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._count(db, "evictions")
+                row = None
+            if row is None:
+                self._count(db, "misses")
+                return None
+            db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self._count(db, "hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict):
+        """Store a result, evicting expired and least recently used entries."""
+        value = json.dumps(result)
+        now = time.time()
+        with closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            evicted = 0
+            if self.max_age is not None:
+                evicted += db.execute("DELETE FROM results WHERE created_at < ?", (now - self.max_age,)).rowcount
+            if self.max_bytes is not None:
+                total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+                if total > self.max_bytes:
+                    # Oldest accesses first, until the rest fits
+                    rows = db.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall()
+                    stale = []
+                    for old_key, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        stale.append((old_key,))
+                        total -= size
+                    db.executemany("DELETE FROM results WHERE key = ?", stale)
+                    evicted += len(stale)
+            if evicted:
+                self._count(db, "evictions", evicted)
+
+    def stats(self) -> Dict[str, float]:
+        """Entries, stored bytes and hit/miss/eviction counts across all processes."""
+        with closing(self._connect()) as db:
+            entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            counters = dict(db.execute("SELECT name, value FROM counters").fetchall())
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "entries": entries,
+            "bytes": size,
+            **counters,
+            "hit_ratio": counters["hits"] / lookups if lookups else 0.0
+        }
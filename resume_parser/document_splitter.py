@@ -1,85 +1,439 @@
+from dataclasses import dataclass
 from glob import glob
 import os
 import re
-from typing import List, Optional
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject
+
+from .headers import DEFAULT_PROFILES, HeaderMatcher
+from .metrics import RunMetrics, timed
+from .models import HeaderProfile
+from .text_extraction import PageTextExtractor, PdfSource, normalize_text, open_pdf, read_source
+
+# Strings shown by a content stream: literal strings (with escaped
+# parentheses) and TJ arrays of literal strings interleaved with kerning
+_SHOWN_STRING = re.compile(rb'\[((?:\((?:[^()\\]|\\.)*\)|[^\[\]()])*)\]\s*TJ|\(((?:[^()\\]|\\.)*)\)', re.S)
+_TJ_PIECE = re.compile(rb'\(((?:[^()\\]|\\.)*)\)|(-?\d*\.?\d+)', re.S)
+# A TJ adjustment moving the next glyph further right than this (in
+# thousandths of an em) is a word space rather than kerning
+_TJ_WORD_SPACE = 200
+_HEX_STRING = re.compile(rb'(?<!<)<[0-9A-Fa-f\s]+>(?!>)')
+_STRING_ESCAPE = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.S)
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f', b'\r\n': b'', b'\n': b'', b'\r': b''}
+_XOBJECT_DRAW = re.compile(rb'/([^\s/\[\]()<>{}%]+)\s+Do\b')
+
+# Font encodings whose byte codes are the (ASCII) characters shown
+_SIMPLE_ENCODINGS = ('/WinAnsiEncoding', '/StandardEncoding', '/MacRomanEncoding')
+
+
+def _unescape(match: re.Match) -> bytes:
+    escape = match.group(1)
+    if escape[:1].isdigit():
+        return bytes([int(escape, 8) & 0xFF])
+    return _ESCAPES.get(escape, escape)
+
+
+def _shown_strings(data: bytes) -> Iterator[bytes]:
+    """Yield the strings a content stream shows; the pieces of a TJ array form one string."""
+    for match in _SHOWN_STRING.finditer(data):
+        array, literal = match.groups()
+        if array is None:
+            yield _STRING_ESCAPE.sub(_unescape, literal)
+            continue
+        pieces = []
+        for piece, adjustment in _TJ_PIECE.findall(array):
+            if not adjustment:
+                pieces.append(_STRING_ESCAPE.sub(_unescape, piece))
+            elif -float(adjustment) > _TJ_WORD_SPACE:
+                pieces.append(b' ')
+        yield b''.join(pieces)
+
+
+def _simple_fonts(resources) -> bool:
+    """True if every font draws single-byte codes that are the characters themselves."""
+    for font in resources.get('/Font', {}).values():
+        font = font.get_object()
+        encoding = font.get('/Encoding')
+        if (font.get('/Subtype') not in ('/Type1', '/TrueType') or '/ToUnicode' in font
+                or (encoding is not None and encoding not in _SIMPLE_ENCODINGS)):
+            return False
+    return True
+
+
+def page_strings(page) -> Optional[List[str]]:
+    """Read the text strings of a page straight from its content stream.
+
+    Much cheaper than ``extract_text()``, which interprets every operator,
+    but only reliable for simple PDFs. Returns None when the raw strings may
+    not be the text shown: hex strings, fonts with custom encodings or
+    ToUnicode maps, or text drawn from form XObjects. The pieces of a kerned
+    ``TJ`` array are joined into one string, as they are drawn as one run.
+
+    Returns:
+        Whitespace-normalised strings in content-stream order, or None
+    """
+    contents = page.get_contents()
+    if contents is None:
+        return []
+    data = contents.get_data()
+    resources = page.get('/Resources')
+    resources = resources.get_object() if resources is not None else {}
+    if _HEX_STRING.search(data) or not _simple_fonts(resources):
+        return None
+
+    xobjects = resources.get('/XObject')
+    if xobjects is not None:
+        xobjects = xobjects.get_object()
+        for name in _XOBJECT_DRAW.findall(data):
+            xobject = xobjects.get('/' + name.decode('latin-1'))
+            if xobject is not None and xobject.get_object().get('/Subtype') == '/Form':
+                return None
+
+    return [normalize_text(string.decode('latin-1')).strip() for string in _shown_strings(data)]
+
+
+@dataclass
+class ResumeBoundary:
+    """Page range of a single resume inside the combined PDF."""
+    filename: str
+    start: int  # index of the header page
+    end: int    # exclusive
+    institution: Optional[str] = None  # name of the header profile matched
 
 
 class ResumeSplitter:
-    def __init__(self, input_file: str, output_dir: str):
+    # Resource names referenced from a page content stream (/F1 Tf, /I1 Do, ...)
+    RESOURCE_NAME_PATTERN = re.compile(rb'/([^\s/\[\]()<>{}%]+)')
+
+    def __init__(self, input_file: PdfSource, output_dir: Optional[str] = None, compact: bool = True,
+                 text_extractor: Optional[PageTextExtractor] = None,
+                 metrics: Optional[RunMetrics] = None,
+                 profiles: Optional[Sequence[HeaderProfile]] = None):
         """Initialize ResumeSplitter with input PDF and output directory.
-        
+
         Args:
-            input_file: Path to the combined PDF file containing multiple resumes
-            output_dir: Directory where individual resumes will be saved
+            input_file: Combined PDF containing multiple resumes, as a path, bytes
+                or binary file object (e.g. an upload, which is never written to disk)
+            output_dir: Directory where individual resumes will be saved; only
+                needed when writing split PDFs
+            compact: Write only the fonts/images each resume references and
+                compress content streams. Compiled PDFs share one resource
+                dictionary across all pages, so without this every split file
+                carries a copy of every image in the batch.
+            text_extractor: Engine used to extract page text; shards large
+                PDFs across a process pool by default
+            metrics: Receives per-resume extract and split timings from
+                iter_resumes()
+            profiles: Institution headers that start a resume, each with its
+                registration number format; NITK only by default. Pages of
+                mixed-institution compilations are matched against all of
+                them in a single search.
         """
         self.input_file = input_file
         self.output_dir = output_dir
-        self.pattern = "NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA, SURATHKAL P.O SRINIVASNAGAR, MANGALORE-575025"
-        
+        self._source = read_source(input_file)
+        self.compact = compact
+        self.bytes_written = 0
+        self.text_extractor = text_extractor or PageTextExtractor()
+        self.metrics = metrics or RunMetrics()
+        self.profiles = list(profiles or DEFAULT_PROFILES)
+        self.matcher = HeaderMatcher(self.profiles)
+        self.pattern = self.profiles[0].header_text  # header of the first profile
+
+        # Per-page index, built once by index_pages()
+        self.page_texts: List[str] = []
+        self.boundaries: List[ResumeBoundary] = []
+        self._reader: Optional[PdfReader] = None
+        self._header_count = 0
+        self._page_count = 0
+        self._indexed = False
+        self._detected = False  # boundaries and header count are known
+        self.text_fallbacks = 0
+
+    def index_pages(self) -> List[ResumeBoundary]:
+        """Extract the text of every page once and record resume boundaries.
+
+        The result is cached, so splitting, verification and parsing all read
+        from the same index instead of extracting the PDF again.
+
+        Returns:
+            List of resume boundaries in page order
+        """
+        if self._indexed:
+            return self.boundaries
+
+        reader = self._reader or open_pdf(self._source)
+        page_texts = self.text_extractor.extract(self._source, reader)
+        boundaries = []
+        header_count = 0
+
+        for num, clean_text in enumerate(page_texts):
+            headers = self.matcher.find(clean_text)
+            header_count += len(headers)
+            if headers:
+                # Close the previous resume and start a new one
+                if boundaries:
+                    boundaries[-1].end = num
+                boundaries.append(ResumeBoundary(
+                    filename=self._extract_filename(clean_text.strip(), num, headers[0]),
+                    start=num,
+                    end=num + 1,
+                    institution=headers[0].name
+                ))
+
+        if boundaries:
+            boundaries[-1].end = len(page_texts)
+
+        self._reader = reader
+        self.page_texts = page_texts
+        self.boundaries = boundaries
+        self._header_count = header_count
+        self._page_count = len(page_texts)
+        self._indexed = self._detected = True
+        return boundaries
+
+    def find_boundaries(self) -> List[ResumeBoundary]:
+        """Find resume boundaries without extracting the text of every page.
+
+        Each page's content stream is searched for the header strings, and
+        the registration number is read from the string after the profile's
+        label. Only pages where that is ambiguous (see page_strings(), a
+        partial header, or a header page without a readable registration
+        number) fall back to full text extraction; ``text_fallbacks`` counts
+        them. Page texts are not kept, so use index_pages() when they are
+        needed as well.
+
+        Returns:
+            List of resume boundaries in page order
+        """
+        if self._detected:
+            return self.boundaries
+
+        reader = self._reader or open_pdf(self._source)
+        boundaries = []
+        header_count = 0
+        self.text_fallbacks = 0
+
+        for num, page in enumerate(reader.pages):
+            headers, filename = self._detect_header(page_strings(page), num)
+            if headers is None:
+                self.text_fallbacks += 1
+                clean_text = normalize_text(page.extract_text())
+                headers = self.matcher.find(clean_text)
+                filename = self._extract_filename(clean_text.strip(), num, headers[0]) if headers else None
+            header_count += len(headers)
+            if headers:
+                if boundaries:
+                    boundaries[-1].end = num
+                boundaries.append(ResumeBoundary(
+                    filename=filename,
+                    start=num,
+                    end=num + 1,
+                    institution=headers[0].name
+                ))
+
+        if boundaries:
+            boundaries[-1].end = len(reader.pages)
+
+        self._reader = reader
+        self.boundaries = boundaries
+        self._header_count = header_count
+        self._page_count = len(reader.pages)
+        self._detected = True
+        return boundaries
+
+    def _detect_header(self, strings: Optional[List[str]],
+                       page_num: int) -> Tuple[Optional[List[HeaderProfile]], Optional[str]]:
+        """Match headers and read the filename from raw page strings.
+
+        Returns:
+            (profile of every header found, filename); the profiles are None
+            if the page needs full text extraction
+        """
+        if strings is None:
+            return None, None
+        text = normalize_text(" ".join(strings))
+        headers = self.matcher.find(text)
+        if not headers:
+            return (None, None) if self.matcher.partial(text) else ([], None)
+
+        reg_no = self.matcher.reg_no_from_strings(strings, headers[0])
+        if reg_no is None:
+            return None, None
+        return headers, f"{reg_no}.pdf"
+
     def split_resumes(self) -> int:
         """Split the combined PDF into individual resume files.
-        
+
         Returns:
             Number of resumes extracted
         """
-        reader = PdfReader(self.input_file)
-        pages = []
-        filename = None
-        
-        for num in range(len(reader.pages)):
-            page = reader.pages[num]
-            text = page.extract_text()
-            clean_text = re.sub(r'\s\s+', ' ', text).strip()
-
-            # Save the previous resume
-            if self.pattern in clean_text:
-                if pages:
-                    self._save_resume(pages, filename)
-                
-                # Start the new resume
-                pages = [page]
-                filename = self._extract_filename(clean_text, num)
-            else:
-                pages.append(page)
-                
-        # Save the last resume
-        if pages and filename:
-            self._save_resume(pages, filename)
-            
+        for boundary in self.find_boundaries():
+            pages = self._reader.pages[boundary.start:boundary.end]
+            self._save_resume(pages, boundary.filename)
+
         return len(glob(os.path.join(self.output_dir, "*.pdf")))
-    
+
+    def resume_texts(self) -> Iterator[Tuple[str, str]]:
+        """Yield (filename, text) for every resume from the page index.
+
+        The text is the per-page whitespace-normalised text joined by newlines,
+        identical to what ResumeParser extracts from the split PDF.
+        """
+        for boundary in self.index_pages():
+            yield boundary.filename, "\n".join(self.page_texts[boundary.start:boundary.end])
+
+    def iter_resumes(self, save_pdfs: bool = False) -> Iterator[Tuple[str, str]]:
+        """Stream (filename, text) for every resume in a single pass.
+
+        Unlike resume_texts(), pages are not indexed up front: each resume is
+        yielded as soon as the next header page (or the end of the PDF) is
+        reached and its page texts are dropped afterwards, so memory stays
+        flat however large the compiled PDF is. Boundaries and header counts
+        are still recorded, so verify_split() works once the stream is
+        exhausted.
+
+        The time spent extracting each resume's pages and splitting it off
+        (joining its text and writing its PDF) is recorded in ``metrics``.
+
+        Args:
+            save_pdfs: Also write each resume to output_dir as it is found
+        """
+        source = read_source(self._source)
+        # Written pages stay in the reader's cache (and are pruned in place),
+        # so the writing reader is reopened once a shard's worth of pages has
+        # been written, as iter_pages() does for extraction
+        reader = open_pdf(source) if save_pdfs else None
+        reader_start = 0
+        self.boundaries = []
+        self._header_count = 0
+        self._page_count = 0
+        self._detected = False
+        current: Optional[ResumeBoundary] = None
+        pages: List[str] = []
+        extract_wall = extract_cpu = 0.0
+
+        # CPU time comes from the extractor, which may run pypdf in worker
+        # processes; timed() only supplies the wall time waited for each page
+        page_stream = timed(self.text_extractor.iter_timed_pages(source))
+        for num, ((clean_text, cpu), wall, _) in enumerate(page_stream):
+            self._page_count = num + 1
+            headers = self.matcher.find(clean_text)
+            self._header_count += len(headers)
+            if headers:
+                if current is not None:
+                    if reader is not None and current.start - reader_start >= self.text_extractor.pages_per_shard:
+                        reader, reader_start = open_pdf(source), current.start
+                    yield self._finish_resume(current, pages, reader, extract_wall, extract_cpu)
+                current = ResumeBoundary(
+                    filename=self._extract_filename(clean_text.strip(), num, headers[0]),
+                    start=num,
+                    end=num + 1,
+                    institution=headers[0].name
+                )
+                self.boundaries.append(current)
+                pages = []
+                extract_wall = extract_cpu = 0.0
+            if current is not None:
+                current.end = num + 1
+                pages.append(clean_text)
+                extract_wall += wall
+                extract_cpu += cpu
+
+        if current is not None:
+            yield self._finish_resume(current, pages, reader, extract_wall, extract_cpu)
+        self._detected = True
+
+    def _finish_resume(self, boundary: ResumeBoundary, pages: List[str], reader: Optional[PdfReader],
+                       extract_wall: float, extract_cpu: float) -> Tuple[str, str]:
+        source_id = Path(boundary.filename).stem
+        self.metrics.record('extract', source_id, extract_wall, extract_cpu)
+        with self.metrics.stage('split', source_id):
+            if reader is not None:
+                self._save_resume(reader.pages[boundary.start:boundary.end], boundary.filename)
+            text = "\n".join(pages)
+        return boundary.filename, text
+
     def _save_resume(self, pages: List, filename: str):
         """Save the accumulated pages as a single resume PDF."""
         writer = PdfWriter()
         for page in pages:
-            writer.add_page(page)
-        
+            if self.compact:
+                self._prune_resources(page)
+            written_page = writer.add_page(page)
+            if self.compact:
+                written_page.compress_content_streams()
+
         output_path = os.path.join(self.output_dir, filename)
         with open(output_path, 'wb') as out:
             writer.write(out)
-    
-    def _extract_filename(self, text: str, page_num: int) -> str:
-        """Extract registration number for filename from text."""
-        reg_no_line = [line for line in text.split("\n") if 'Reg. No. :' in line]
-        if reg_no_line:
-            reg_no = reg_no_line[0].split(":")[-1].strip()
-        else:
-            reg_no = f'page_{page_num}'
-        return f"{reg_no}.pdf"
-    
-    def verify_split(self) -> bool:
+            self.bytes_written += out.tell()
+
+    def _prune_resources(self, page):
+        """Replace the page's resources with only the fonts/XObjects it uses.
+
+        The shared resource dictionary of the compiled PDF is left untouched;
+        the page gets its own filtered copy, so PdfWriter only clones the
+        objects this page actually draws.
+        """
+        resources = page.get('/Resources')
+        contents = page.get_contents()
+        if resources is None or contents is None:
+            return
+
+        used = {
+            name.decode('latin-1')
+            for name in self.RESOURCE_NAME_PATTERN.findall(contents.get_data())
+        }
+
+        pruned = DictionaryObject()
+        for key, value in resources.get_object().items():
+            if key in ('/XObject', '/Font'):
+                value = DictionaryObject({
+                    NameObject(name): ref
+                    for name, ref in value.get_object().items()
+                    if name[1:] in used
+                })
+            pruned[NameObject(key)] = value
+        page[NameObject('/Resources')] = pruned
+
+    def _extract_filename(self, text: str, page_num: int, profile: Optional[HeaderProfile] = None) -> str:
+        """Extract registration number for filename from text.
+
+        Args:
+            text: Extracted text of the header page
+            page_num: Page index, used in the filename if no number is found
+            profile: Header profile matched on the page; the first profile if None
+        """
+        reg_no = self.matcher.reg_no(text, profile or self.profiles[0])
+        return f"{reg_no or f'page_{page_num}'}.pdf"
+
+    def verify_split(self, check_files: bool = True) -> bool:
         """Verify that all resumes were correctly split.
-        
+
+        Header matches are counted from the boundary pass already made
+        (find_boundaries(), index_pages() or a completed iter_resumes()
+        stream), so the PDF is not searched a second time. A header that
+        pass cannot read would be missed by both counts, so a non-empty PDF
+        without any resume fails verification.
+
+        Args:
+            check_files: Also compare against the PDFs written to output_dir.
+                Disable when split_resumes() was skipped.
+
         Returns:
             True if verification passes, False otherwise
         """
-        reader = PdfReader(self.input_file)
-        clean_texts = "\n".join([re.sub(r'\s\s+', ' ', page.extract_text()) 
-                               for page in reader.pages])
-        
-        pattern_count = len(re.findall(self.pattern, clean_texts))
+        if not self._detected:
+            self.find_boundaries()
+        if self._page_count and not self.boundaries:
+            return False
+        if not check_files:
+            return self._header_count == len(self.boundaries)
+
         file_count = len(glob(os.path.join(self.output_dir, "*.pdf")))
-        
-        return pattern_count == file_count 
\ No newline at end of file
+
+        return self._header_count == file_count
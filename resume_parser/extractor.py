@@ -1,7 +1,16 @@
+import os
 import re
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Dict, Optional
 from .models import ExtraCurricular
 
+
+def _extract_chunk(extractor_cls: type, texts: List[str]) -> List[ExtraCurricular]:
+    """Extract a chunk of resume texts. Runs in a worker process."""
+    extractor = extractor_cls()
+    return [extractor.extract(text) for text in texts]
+
+
 class ExtraCurricularExtractor:
     """Extract extra-curricular activities using pattern matching."""
     
@@ -47,6 +56,10 @@ class ExtraCurricularExtractor:
     # Pattern to identify references
     REFERENCE_PATTERN = re.compile(r"^reference\s*\d*\s*:", re.IGNORECASE)
     
+    # Item cleaning
+    LEADING_NON_ALPHA = re.compile(r'^[^a-zA-Z]+')
+    MAX_ITEMS = 5
+    
     def __init__(self):
         # Compile all patterns
         self.section_patterns = {
@@ -56,41 +69,56 @@ class ExtraCurricularExtractor:
             'activities': [re.compile(p, re.IGNORECASE) for p in self.ACTIVITIES_PATTERNS],
             'languages': [re.compile(p, re.IGNORECASE) for p in self.LANGUAGES_PATTERNS]
         }
+        
+        # One alternation per section, and one over all sections, so each line
+        # is tested for a header with a single search. Only header lines are
+        # then matched per section, as a line may start several sections.
+        self.section_matchers = {
+            section: re.compile('|'.join(f'(?:{p.pattern})' for p in patterns), re.IGNORECASE)
+            for section, patterns in self.section_patterns.items()
+        }
+        header_alternation = '|'.join(f'(?:{p.pattern})' for p in self.section_matchers.values())
+        self.header_pattern = re.compile(header_alternation, re.IGNORECASE)
+        # For ASCII lines, lowercasing and matching case-sensitively is
+        # equivalent and much cheaper than IGNORECASE over the alternation
+        self._ascii_header_pattern = re.compile(header_alternation)
     
-    def _find_section_bounds(self, text: str, patterns: List[re.Pattern]) -> List[tuple]:
-        """Find the start and end positions of sections matching the patterns."""
-        bounds = []
-        lines = text.split('\n')
+    def _is_header(self, line: str) -> bool:
+        """Check a line against every section header pattern at once."""
+        if line.isascii():
+            return self._ascii_header_pattern.search(line.lower()) is not None
+        return self.header_pattern.search(line) is not None
+    
+    def _find_section_bounds(self, lines: List[str]) -> Dict[str, List[tuple]]:
+        """Find the content bounds of every section in a single pass.
+        
+        Each line is classified once as a section header and/or reference
+        line. A section starting at a header runs until the next header or
+        reference line, which is looked up in the index of stop lines.
+        """
+        headers = []  # (line number, matched sections) of non-reference headers
+        stops = []    # line numbers that end a section
         
         for i, line in enumerate(lines):
-            # Skip if this is a reference line
-            if self.REFERENCE_PATTERN.search(line):
-                continue
-                
-            for pattern in patterns:
-                if pattern.search(line):
-                    start = i
-                    # Look for the next section header or end of text
-                    end = len(lines)
-                    for j in range(i + 1, len(lines)):
-                        # Stop if we hit a reference section
-                        if self.REFERENCE_PATTERN.search(lines[j]):
-                            end = j
-                            break
-                        # Stop if we hit another section header
-                        for pat_list in self.section_patterns.values():
-                            for p in pat_list:
-                                if p.search(lines[j]):
-                                    end = j
-                                    break
-                            if end != len(lines):
-                                break
-                        if end != len(lines):
-                            break
-                    
-                    if start + 1 < end:  # Only include if there's content
-                        bounds.append((start + 1, end))
-                    break
+            is_reference = self.REFERENCE_PATTERN.search(line) is not None
+            if self._is_header(line):
+                stops.append(i)
+                if not is_reference:
+                    sections = [s for s, p in self.section_matchers.items() if p.search(line)]
+                    headers.append((i, sections))
+            elif is_reference:
+                stops.append(i)
+        
+        bounds = {section: [] for section in self.section_patterns}
+        next_stop = 0
+        for start, sections in headers:
+            while next_stop < len(stops) and stops[next_stop] <= start:
+                next_stop += 1
+            end = stops[next_stop] if next_stop < len(stops) else len(lines)
+            
+            if start + 1 < end:  # Only include if there's content
+                for section in sections:
+                    bounds[section].append((start + 1, end))
         
         return bounds
     
@@ -134,27 +162,30 @@ class ExtraCurricularExtractor:
             if self.REFERENCE_PATTERN.search(item):
                 continue
                 
-            # Remove any numbers or special characters from start
-            item = re.sub(r'^[^a-zA-Z]+', '', item)
+            # Remove any numbers or special characters from start, so a
+            # non-empty item always starts with a letter
+            item = self.LEADING_NON_ALPHA.sub('', item)
             # Remove extra whitespace
-            item = re.sub(r'\s+', ' ', item).strip()
-            # Only include items with more than 3 words and containing letters
-            if len(item.split()) > 3 and re.search(r'[a-zA-Z]', item):
-                cleaned.append(item)
+            words = item.split()
+            # Only include items with more than 3 words
+            if len(words) > 3:
+                cleaned.append(' '.join(words))
+                if len(cleaned) == self.MAX_ITEMS:  # Keep only top 5 items as per model requirement
+                    break
         
-        return cleaned[:5]  # Keep only top 5 items as per model requirement
+        return cleaned
     
     def extract(self, text: str) -> ExtraCurricular:
         """Extract extra-curricular information from text."""
         extracted = {}
         lines = text.split('\n')
+        section_bounds = self._find_section_bounds(lines)
         
         # Extract each section
-        for section, patterns in self.section_patterns.items():
+        for section in self.section_patterns:
             section_items = []
-            bounds = self._find_section_bounds(text, patterns)
             
-            for start, end in bounds:
+            for start, end in section_bounds[section]:
                 section_lines = lines[start:end]
                 items = self._extract_items(section_lines)
                 section_items.extend(items)
@@ -169,3 +200,33 @@ class ExtraCurricularExtractor:
             activities=extracted.get('activities', []),
             languages=extracted.get('languages', [])
         )
+    
+    def extract_many(self, texts: Iterable[str], max_workers: Optional[int] = None,
+                     chunk_size: int = 64) -> List[ExtraCurricular]:
+        """Extract extra-curricular information from a batch of resume texts.
+        
+        Batches larger than one chunk are split into chunks of ``chunk_size``
+        texts and extracted in a process pool; smaller batches run in the
+        calling process to avoid the pool start-up cost.
+        
+        Args:
+            texts: Resume texts, e.g. a whole archived cohort
+            max_workers: Size of the process pool. Defaults to the CPU count;
+                1 disables the pool.
+            chunk_size: Number of texts handed to a worker at a time
+            
+        Returns:
+            One ExtraCurricular per text, in input order
+        """
+        texts = list(texts)
+        max_workers = max_workers or os.cpu_count() or 1
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        
+        if max_workers == 1 or len(chunks) <= 1:
+            return [self.extract(text) for text in texts]
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            for chunk_results in executor.map(_extract_chunk, [type(self)] * len(chunks), chunks):
+                results.extend(chunk_results)
+        return results
@@ -0,0 +1,125 @@
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .models import HeaderProfile
+
+NITK = HeaderProfile(
+    name='NITK',
+    header=['NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA, SURATHKAL', 'P.O SRINIVASNAGAR, MANGALORE-575025']
+)
+
+DEFAULT_PROFILES = (NITK,)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def load_header_profiles(path: str) -> List[HeaderProfile]:
+    """Load header profiles from a JSON file holding a list of profiles."""
+    with open(path) as f:
+        return [HeaderProfile.model_validate(profile) for profile in json.load(f)]
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Compile literal strings into one regular expression sharing their prefixes.
+
+    The words are stored in a character trie and emitted as nested
+    alternations, e.g. ``['ABC', 'ABD']`` becomes ``AB(?:C|D)``. The regex
+    engine then walks each shared prefix once instead of trying every word
+    in turn, and a page is searched once for all words. Where one word is a
+    prefix of another, the longer word wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        if not word:
+            raise ValueError("Cannot match an empty string")
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _trie_node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        pattern = f'(?:{pattern})?'
+    return pattern
+
+
+class HeaderMatcher:
+    """Find the header pages of several institutions in a single search.
+
+    The full headers of all profiles are compiled into one trie-shaped
+    regex, and so are their first lines, which are used to flag pages that
+    carry only part of a header. First lines are compared without
+    whitespace, so a header drawn in fragments split mid-word is still
+    flagged. Each profile also gets a registration number extractor built
+    from its label and pattern.
+    """
+
+    def __init__(self, profiles: Sequence[HeaderProfile]):
+        """Compile the matchers.
+
+        Args:
+            profiles: Header profiles; raises ValueError if empty or if two
+                profiles share a name or header
+        """
+        if not profiles:
+            raise ValueError("At least one header profile is required")
+        self.profiles = list(profiles)
+        self._by_header: Dict[str, HeaderProfile] = {}
+        for profile in self.profiles:
+            if profile.header_text in self._by_header:
+                raise ValueError(f"Duplicate header: {profile.header_text}")
+            self._by_header[profile.header_text] = profile
+        if len({profile.name for profile in self.profiles}) < len(self.profiles):
+            raise ValueError("Header profile names must be unique")
+
+        self._headers = re.compile(trie_pattern(self._by_header))
+        self._first_lines = re.compile(trie_pattern({_WHITESPACE.sub('', profile.header[0]) for profile in self.profiles}))
+        self._reg_no_line = {
+            profile.name: re.compile(
+                rf'{re.escape(profile.reg_no_label)}[^\S\n]*:[^\S\n]*({profile.reg_no_pattern})[^\S\n]*(?:\n|$)'
+            )
+            for profile in self.profiles
+        }
+        self._reg_no_label = {
+            profile.name: re.compile(rf'{re.escape(profile.reg_no_label)}\s*:\s*(.*)', re.S)
+            for profile in self.profiles
+        }
+        self._reg_no = {profile.name: re.compile(profile.reg_no_pattern) for profile in self.profiles}
+
+    def find(self, text: str) -> List[HeaderProfile]:
+        """Return the profile of every header in ``text``, in order of appearance."""
+        return [self._by_header[match.group()] for match in self._headers.finditer(text)]
+
+    def partial(self, text: str) -> bool:
+        """True if ``text`` contains the first header line of any profile, ignoring whitespace."""
+        return self._first_lines.search(_WHITESPACE.sub('', text)) is not None
+
+    def reg_no(self, text: str, profile: HeaderProfile) -> Optional[str]:
+        """Read the registration number from extracted page text.
+
+        The number must be the rest of the line after the profile's label.
+        """
+        match = self._reg_no_line[profile.name].search(text)
+        return match.group(1) if match else None
+
+    def reg_no_from_strings(self, strings: Sequence[str], profile: HeaderProfile) -> Optional[str]:
+        """Read the registration number from the raw strings of a page.
+
+        The number either follows the label in the same string or is the
+        next non-empty string, as when label and value are drawn separately.
+        """
+        label = self._reg_no_label[profile.name]
+        for i, string in enumerate(strings):
+            match = label.fullmatch(string)
+            if match is None:
+                continue
+            reg_no = match.group(1).strip() or next((s for s in strings[i + 1:] if s), '')
+            return reg_no if self._reg_no[profile.name].fullmatch(reg_no) else None
+        return None
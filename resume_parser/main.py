@@ -1,74 +1,155 @@
 import os
 import asyncio
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
 
 from .document_splitter import ResumeSplitter
+from .headers import load_header_profiles
 from .parser import ResumeParser
-from .utils import TokenUsage, save_resume_data
+from .scheduler import LLMScheduler
+from .manifest import BatchManifest, DONE, FAILED
+from .metrics import RunMetrics
+from .models import HeaderProfile
+from .pipeline import SKIPPED, iter_in_thread, run_pipeline
+from .store import CohortStore
+from .writer import ResultWriter
+from .utils import TokenLedger
 
-async def process_resume(parser: ResumeParser, resume_path: Path, csv_output_dir: Path):
-    """Process a single resume asynchronously."""
-    try:
-        resume_info, extra_info, token_usage = await parser.parse_resume(str(resume_path))
-        
-        # Save resume information using utility function
-        save_resume_data(resume_info, extra_info, csv_output_dir)
-        
-        # Save token usage
-        token_usage.save_to_csv(csv_output_dir)
-        
-        print(f"Successfully parsed and saved resume: {resume_path.name}")
-        return True
-    except Exception as e:
-        print(f"Error processing resume {resume_path.name}: {str(e)}")
-        return False
+def _env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Read an optional integer setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+async def process_resumes_async(input_pdf: str, output_dir: str, save_pdfs: bool = True,
+                                incremental: bool = True, export_csv: bool = False,
+                                header_profiles: Optional[List[HeaderProfile]] = None) -> None:
+    """Process resumes asynchronously.
+
+    The compiled PDF is streamed through the pipeline: each resume is parsed
+    and scored as soon as its pages are extracted, so the first candidates
+    are scored within seconds and memory stays flat for any batch size. The
+    split PDFs are never read back; writing them to ``<output_dir>/pdfs`` is
+    an optional side output controlled by ``save_pdfs``. The split is
+    verified once the whole PDF has been streamed.
+
+    Progress is checkpointed in ``<output_dir>/manifest.jsonl``. With
+    ``incremental`` set, resumes whose text was already processed successfully
+    are skipped, so a crashed or partially failed batch only reruns the
+    missing and failed items.
 
-async def process_resumes_async(input_pdf: str, output_dir: str) -> None:
-    """Process resumes asynchronously."""
+    Parsed candidates are written to cohort-level Parquet tables in
+    ``<output_dir>/cohort``. Set ``export_csv`` to also write the
+    per-candidate CSVs to ``<output_dir>/parsed_data``.
+
+    Wall time, CPU time and queue wait of every stage (extract, split,
+    queue, llm, regex, score, write) are recorded per resume and summarised
+    with percentiles and throughput in ``<output_dir>/run_report.json``.
+
+    Resumes start at an institution header. ``header_profiles`` (or the JSON
+    file named by the HEADER_PROFILES environment variable) lists the
+    institutions of a mixed compilation; NITK only by default.
+    """
     # Load environment variables
     load_dotenv()
     
     # Create output directories
     pdf_output_dir = Path(output_dir) / "pdfs"
-    csv_output_dir = Path(output_dir) / "parsed_data"
-    os.makedirs(pdf_output_dir, exist_ok=True)
-    os.makedirs(csv_output_dir, exist_ok=True)
+    # save_resume_data writes under <csv_output_dir>/parsed_data/<reg_no>
+    csv_output_dir = Path(output_dir) if export_csv else None
     
-    # Split the combined PDF
-    splitter = ResumeSplitter(input_pdf, pdf_output_dir)
-    num_resumes = splitter.split_resumes()
+    metrics = RunMetrics()
     
-    if not splitter.verify_split():
-        raise ValueError("Resume splitting verification failed")
-        
-    print(f"Successfully split {num_resumes} resumes")
+    if header_profiles is None and os.getenv('HEADER_PROFILES'):
+        header_profiles = load_header_profiles(os.getenv('HEADER_PROFILES'))
+    
+    # Resumes are split from the combined PDF while it streams
+    splitter = ResumeSplitter(input_pdf, pdf_output_dir, metrics=metrics, profiles=header_profiles)
+    if save_pdfs:
+        os.makedirs(pdf_output_dir, exist_ok=True)
+    
+    # Bound concurrency and keep within the provider's rate limits
+    scheduler = LLMScheduler(
+        max_in_flight=_env_int('DEEPSEEK_MAX_IN_FLIGHT', 8),
+        requests_per_minute=_env_int('DEEPSEEK_RPM'),
+        tokens_per_minute=_env_int('DEEPSEEK_TPM')
+    )
     
     # Initialize parser
     parser = ResumeParser(
         api_key=os.getenv('DEEPSEEK_API_KEY'),
-        base_url=os.getenv('DEEPSEEK_URL')
+        base_url=os.getenv('DEEPSEEK_URL'),
+        scheduler=scheduler,
+        save_raw_responses=False,  # written by the result writer
+        metrics=metrics
     )
     
-    # Process resumes concurrently
-    tasks = []
-    for resume_file in pdf_output_dir.glob("*.pdf"):
-        task = process_resume(parser, resume_file, csv_output_dir)
-        tasks.append(task)
+    manifest = BatchManifest(Path(output_dir) / "manifest.jsonl")
+    store = CohortStore(Path(output_dir) / "cohort")
+    ledger = TokenLedger(Path(output_dir) / "token_usage.jsonl")
+    writer = ResultWriter(store, csv_output_dir, ledger=ledger, metrics=metrics)
+    report_path = Path(output_dir) / "run_report.json"
+    
+    # Stream resumes through parsing and scoring; workers beyond the LLM
+    # slots keep cache hits and pattern matching flowing
+    counts = {DONE: 0, FAILED: 0, SKIPPED: 0}
+    resumes = iter_in_thread(splitter.iter_resumes(save_pdfs=save_pdfs))
+    try:
+        async for result in run_pipeline(resumes, parser, writer, manifest, incremental,
+                                          concurrency=scheduler.max_in_flight * 2, metrics=metrics):
+            counts[result.status] += 1
+            if result.scores is not None:
+                print(f"Scored {result.source_id}: {result.scores['total_score']:.2f} "
+                      f"({sum(counts.values())} resumes so far)")
+    finally:
+        await writer.close()
+        await parser.aclose()
+        # Written even for a failed run, to show where it stalled
+        report = metrics.write_report(
+            report_path,
+            tokens=ledger.summary(),
+            peak_concurrent_llm_requests=scheduler.peak_in_flight
+        )
+    
+    if not splitter.verify_split(check_files=save_pdfs):
+        raise ValueError("Resume splitting verification failed")
     
-    # Wait for all tasks to complete
-    results = await asyncio.gather(*tasks)
+    print(f"Successfully split {sum(counts.values())} resumes")
+    if save_pdfs:
+        print(f"Wrote {splitter.bytes_written / 1024:.1f} KiB of split PDFs")
     
     # Print summary
-    successful = sum(results)
     print(f"\nProcessing complete:")
-    print(f"Successfully processed: {successful}")
-    print(f"Failed: {len(results) - successful}")
+    print(f"Successfully processed: {counts[DONE]}")
+    print(f"Failed: {counts[FAILED]}")
+    print(f"Skipped (already processed): {counts[SKIPPED]}")
+    print(f"Cohort tables: {store.root} ({writer.written} written in {writer.batches} batches, "
+          f"{writer.failed} write errors)")
+    print(f"Peak concurrent LLM requests: {scheduler.peak_in_flight}")
+    print(f"Prompt cache hit ratio: {parser.prompt_cache.hit_ratio:.1%}")
+    stats = parser.retry_stats
+    print(f"Retried: {stats.retried} ({stats.retries} retries), "
+          f"timed out: {stats.timed_out}, gave up: {stats.failed}")
+    usage = ledger.summary()
+    print(f"Tokens: {usage['total_tokens']} total ({usage['prompt_tokens']} prompt, "
+          f"{usage['cached_tokens']} cached, {usage['completion_tokens']} completion) "
+          f"over {usage['llm_calls']} LLM calls")
+    print(f"Tokens per resume: p50 {usage['p50_tokens']:.0f}, p90 {usage['p90_tokens']:.0f}, "
+          f"p99 {usage['p99_tokens']:.0f}")
+    print(f"Estimated cost: ${usage['estimated_cost']:.4f} (ledger: {ledger.path}, batch {ledger.batch_id})")
+    print(f"\nStage timings (seconds per resume, run report: {report_path}):")
+    for name, stage in report['stages'].items():
+        wall, wait = stage['wall'], stage['wait']
+        print(f"  {name:<8} n={stage['count']:<6} p50 {wall['p50']:.3f}  p95 {wall['p95']:.3f}  "
+              f"p99 {wall['p99']:.3f}  wait p95 {wait['p95']:.3f}")
+    print(f"Throughput: {report['resumes_per_minute']:.1f} resumes/min over {report['elapsed_seconds']:.1f}s")
 
-def process_resumes(input_pdf: str, output_dir: str) -> None:
+def process_resumes(input_pdf: str, output_dir: str, save_pdfs: bool = True,
+                    incremental: bool = True, export_csv: bool = False,
+                    header_profiles: Optional[List[HeaderProfile]] = None) -> None:
     """Entry point for resume processing."""
-    asyncio.run(process_resumes_async(input_pdf, output_dir))
+    asyncio.run(process_resumes_async(input_pdf, output_dir, save_pdfs, incremental, export_csv,
+                                      header_profiles))
 
 if __name__ == "__main__":
     process_resumes(
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from .text_extraction import normalize_text
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def content_hash(text: str) -> str:
+    """Hash of the normalised resume text."""
+    return hashlib.sha256(normalize_text(text).strip().encode()).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class BatchManifest:
+    """Checkpoint of per-resume processing status for a batch.
+
+    Every status change is appended as one JSON line, so a crash loses at most
+    the line being written. On load the log is replayed and the latest entry
+    per resume wins.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the manifest, loading any existing checkpoint.
+
+        Args:
+            path: Location of the JSON-lines manifest file
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # partially written line from a crash
+                self.entries[entry["source_id"]] = entry
+
+    def is_done(self, source_id: str, text_hash: str) -> bool:
+        """True if this exact resume text was already processed successfully."""
+        entry = self.entries.get(source_id)
+        return entry is not None and entry["status"] == DONE and entry["content_hash"] == text_hash
+
+    def mark(self, source_id: str, text_hash: str, status: str, error: Optional[str] = None):
+        """Record a status change for a resume and append it to the log."""
+        self.append(self.update(source_id, text_hash, status, error))
+
+    def update(self, source_id: str, text_hash: str, status: str, error: Optional[str] = None) -> dict:
+        """Record a status change in memory only, returning the entry for append()."""
+        previous = self.entries.get(source_id, {})
+        entry = {
+            "source_id": source_id,
+            "content_hash": text_hash,
+            "status": status,
+            "attempts": previous.get("attempts", 0) + (status == RUNNING),
+            "started_at": _now() if status == RUNNING else previous.get("started_at"),
+            "finished_at": _now() if status in (DONE, FAILED) else None,
+            "error": error
+        }
+        self.entries[source_id] = entry
+        return entry
+
+    def append(self, entry: dict):
+        """Append an entry to the log; may run on another thread than update()."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def counts(self) -> Dict[str, int]:
+        """Number of resumes in each status."""
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
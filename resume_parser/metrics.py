@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+# Pipeline stages in the order a resume passes through them
+STAGES = ('extract', 'split', 'queue', 'llm', 'regex', 'score', 'write')
+
+
+def _process_cpu() -> float:
+    """CPU seconds of this process and its reaped children (e.g. extraction workers)."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def timed(items: Iterable[T]) -> Iterator[Tuple[T, float, float]]:
+    """Yield (item, wall seconds, thread CPU seconds) spent producing each item."""
+    items = iter(items)
+    while True:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        yield item, time.perf_counter() - wall, time.thread_time() - cpu
+
+
+class _StageSamples:
+    """Column-wise samples of one stage; a few dozen bytes per resume."""
+    __slots__ = ('source_ids', 'wall', 'cpu', 'wait')
+
+    def __init__(self):
+        self.source_ids: List[str] = []
+        self.wall = array('d')
+        self.cpu = array('d')
+        self.wait = array('d')
+
+
+class RunMetrics:
+    """Wall time, CPU time and queue wait of every stage of every resume.
+
+    Components record into a shared instance from whichever thread runs the
+    stage: page extraction and splitting on the PDF source thread, pattern
+    matching on its executor, writes on the writer thread and the LLM call
+    on the event loop. ``report()`` turns the samples into per-stage
+    percentiles and batch throughput, showing whether a slow batch was
+    waiting on the provider, pypdf or the disk.
+
+    ``wall`` is the time a stage spent working on a resume and ``wait`` the
+    time the resume queued before the stage started (for the LLM, waiting
+    for a scheduler slot). CPU time is the thread CPU time of the stage,
+    except for extraction, which reports the CPU time pypdf used in whichever
+    process extracted the pages. It is not recorded for the LLM call, whose
+    thread time would include every other coroutine on the event loop.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._cpu_started = _process_cpu()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageSamples] = {}
+        self.results: Dict[str, int] = {}
+        self._first_result: Optional[float] = None
+
+    def record(self, stage: str, source_id: str, wall: float, cpu: float = float('nan'), wait: float = 0.0):
+        """Record one resume's pass through a stage.
+
+        Args:
+            stage: Stage name, see STAGES
+            source_id: Resume the sample belongs to
+            wall: Seconds spent in the stage
+            cpu: Thread CPU seconds spent in the stage; NaN if not measured
+            wait: Seconds queued before the stage started
+        """
+        with self._lock:
+            samples = self._stages.get(stage)
+            if samples is None:
+                samples = self._stages[stage] = _StageSamples()
+            samples.source_ids.append(source_id)
+            samples.wall.append(wall)
+            samples.cpu.append(cpu)
+            samples.wait.append(wait)
+
+    @contextmanager
+    def stage(self, stage: str, source_id: str, wait: float = 0.0) -> Iterator[None]:
+        """Time the enclosed block as ``stage`` on the current thread."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(stage, source_id, time.perf_counter() - wall, time.thread_time() - cpu, wait)
+
+    def completed(self, status: str):
+        """Count a resume leaving the pipeline with ``status``."""
+        with self._lock:
+            self.results[status] = self.results.get(status, 0) + 1
+            if self._first_result is None:
+                self._first_result = time.perf_counter() - self._started
+
+    def _distribution(self, values: array) -> Optional[Dict[str, float]]:
+        values = np.frombuffer(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None
+        summary = {'total': float(values.sum()), 'mean': float(values.mean())}
+        for q, value in zip(self.PERCENTILES, np.percentile(values, self.PERCENTILES)):
+            summary[f'p{q}'] = float(value)
+        summary['max'] = float(values.max())
+        return summary
+
+    def report(self, slowest: int = 5) -> Dict:
+        """Summarise the run.
+
+        Args:
+            slowest: Number of slowest resumes listed per stage
+
+        Returns:
+            JSON-serialisable dict with run totals, throughput and, per stage,
+            the sample count, wall/cpu/wait distributions and slowest resumes
+        """
+        elapsed = time.perf_counter() - self._started
+        with self._lock:
+            stages = {name: self._stages[name] for name in sorted(self._stages, key=_stage_order)}
+            results = dict(self.results)
+            report = {
+                'started_at': self.started_at.isoformat(),
+                'elapsed_seconds': elapsed,
+                'process_cpu_seconds': _process_cpu() - self._cpu_started,
+                'results': results,
+                'resumes_per_minute': sum(results.values()) / elapsed * 60 if elapsed else 0.0,
+                'seconds_to_first_result': self._first_result,
+                'stages': {}
+            }
+            for name, samples in stages.items():
+                order = np.argsort(np.frombuffer(samples.wall, dtype=np.float64))[::-1][:slowest]
+                report['stages'][name] = {
+                    'count': len(samples.wall),
+                    'wall': self._distribution(samples.wall),
+                    'cpu': self._distribution(samples.cpu),
+                    'wait': self._distribution(samples.wait),
+                    'slowest': [
+                        {'source_id': samples.source_ids[i], 'wall': samples.wall[i]} for i in order
+                    ]
+                }
+        return report
+
+    def write_report(self, path: Path, **sections) -> Dict:
+        """Write ``report()`` as JSON, with extra top-level sections (e.g. token totals).
+
+        Returns:
+            The report written
+        """
+        report = {**self.report(), **sections}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+def _stage_order(name: str) -> Tuple[int, str]:
+    return (STAGES.index(name) if name in STAGES else len(STAGES), name)
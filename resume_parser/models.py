@@ -1,3 +1,4 @@
+import json
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
@@ -44,4 +45,39 @@ class ResumeInfo(BaseModel):
     academic_performance: List[AcademicDegreePerformance]
     projects: List[Projects]
     technical_skills: TechnicalSkills
-    
\ No newline at end of file
+    
+
+class ScoringProfile(BaseModel):
+    academic_weight: float = Field(default=20.0, ge=0, description='Maximum academic score')
+    technical_weight: float = Field(default=35.0, ge=0, description='Maximum technical skills score')
+    projects_weight: float = Field(default=30.0, ge=0, description='Maximum projects score')
+    extra_weight: float = Field(default=15.0, ge=0, description='Maximum extra-curricular score')
+    cgpa_weight: float = Field(default=0.75, description='Share of the academic score from the average CGPA')
+    consistency_weight: float = Field(default=0.25, description='Share of the academic score from SGPA consistency (grade scale minus SGPA standard deviation)')
+    grade_scale: float = Field(default=10.0, gt=0, description='Maximum SGPA/CGPA')
+    count_thresholds: List[int] = Field(default=[1, 4], description='A list earns one point for every threshold its length reaches')
+    technical_max_points: float = Field(default=10, gt=0, description='Skill points that earn the full technical score')
+    project_base_points: int = Field(default=5, description='Points for every project')
+    internship_bonus: int = Field(default=5, description='Extra points for a project done at a company')
+    relevance_multiplier: int = Field(default=2, description='Points per count point of skills used in a project')
+    relevance_cap: int = Field(default=10, description='Maximum relevance points per project')
+    non_internship_companies: List[str] = Field(default=['personal', 'na', 'n/a'], description='Lowercased company values that do not count as internships')
+    projects_max_points: float = Field(default=100, gt=0, description='Project points that earn the full projects score')
+    extra_max_points: float = Field(default=8, gt=0, description='Extra-curricular points that earn the full extra-curricular score')
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'ScoringProfile':
+        """Load a profile from a JSON file; omitted fields keep their defaults."""
+        with open(path) as f:
+            return cls.model_validate(json.load(f))
+
+class HeaderProfile(BaseModel):
+    name: str = Field(..., description='Institution name, recorded on the boundaries of its resumes')
+    header: List[str] = Field(..., min_length=1, description='Header lines at the top of the first page of every resume, as whitespace-normalised text')
+    reg_no_label: str = Field(default='Reg. No.', description='Label printed before the registration number, followed by a colon')
+    reg_no_pattern: str = Field(default=r'[A-Za-z0-9/-]+', description='Regular expression a registration number must match')
+
+    @property
+    def header_text(self) -> str:
+        """The header lines as they appear in extracted page text."""
+        return ' '.join(self.header)
@@ -1,96 +1,260 @@
 import os
-import re
-import json
+import time
 import asyncio
-from typing import Tuple
+from concurrent.futures import Executor
+from contextvars import ContextVar
+from typing import Optional, Tuple
 from pathlib import Path
 
+import httpx
 import instructor
-from openai import OpenAI
-from pypdf import PdfReader
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+from openai.types.completion_usage import PromptTokensDetails
+try:
+    from instructor.exceptions import InstructorRetryException
+except ImportError:  # instructor < 1.4
+    from instructor.retry import InstructorRetryException
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt
 
 from .models import ResumeInfo, ExtraCurricular
-from .utils import TokenUsage
+from .utils import TokenUsage, save_raw_response
 from .extractor import ExtraCurricularExtractor
+from .text_extraction import PageTextExtractor, PdfSource
+from .scheduler import LLMScheduler, estimate_tokens
+from .cache import ExtractionCache
+from .metrics import RunMetrics
+from .retry import RetryPolicy, RetryStats, call_with_retries
+from .prompts import PROMPT_VERSION, PromptCacheStats, build_messages, cached_prompt_tokens
+
+# Raw usage blocks of the LLM responses received by the current task
+_response_usage: ContextVar[Optional[list]] = ContextVar("_response_usage", default=None)
+
+# Seconds the current task spent waiting for scheduler slots
+_slot_waits: ContextVar[Optional[list]] = ContextVar("_slot_waits", default=None)
+
+async def _capture_usage(response: httpx.Response):
+    """httpx response hook recording the provider's usage block.
+    
+    instructor replaces each completion's usage with a running total that
+    drops the prompt cache details, so they are read from the raw response.
+    """
+    sink = _response_usage.get()
+    if sink is None or not response.url.path.endswith("/chat/completions"):
+        return
+    await response.aread()
+    try:
+        usage = response.json().get("usage")
+    except ValueError:
+        return
+    if usage:
+        sink.append(usage)
 
 class ResumeParser:
-    def __init__(self, api_key: str, base_url: str):
+    def __init__(self, api_key: str, base_url: str, text_extractor: Optional[PageTextExtractor] = None,
+                 scheduler: Optional[LLMScheduler] = None, http_client: Optional[httpx.AsyncClient] = None,
+                 max_connections: int = 100, model: str = "deepseek-chat",
+                 cache: Optional[ExtractionCache] = None, use_cache: bool = True,
+                 retry_policy: Optional[RetryPolicy] = None, regex_executor: Optional[Executor] = None,
+                 save_raw_responses: bool = True, metrics: Optional[RunMetrics] = None):
         """Initialize ResumeParser with API credentials.
         
         Args:
             api_key: API key for the LLM service
             base_url: Base URL for the LLM service
+            text_extractor: Engine used to extract page text from PDFs
+            scheduler: Limits concurrent LLM requests and their rate; unbounded if None
+            http_client: Shared connection pool; one is created if not given
+            max_connections: Size of the created connection pool
+            model: LLM model name
+            cache: On-disk extraction cache; defaults to data/llm_cache
+            use_cache: Set to False to always call the LLM
+            retry_policy: Retries, backoff and deadlines for LLM requests
+            regex_executor: Executor running the pattern-based extraction off the
+                event loop; the loop's default thread pool if None
+            save_raw_responses: Write each raw LLM response to data/raw_responses
+                from ``parse_text``; disable when a ResultWriter saves them instead
+            metrics: Receives per-resume LLM and pattern matching timings
         """
-        self.client = instructor.from_openai(OpenAI(api_key=api_key, base_url=base_url))
+        # Requests run on the event loop and reuse keep-alive connections from one pool
+        self.http_client = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60.0
+            ),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+        # Parsers sharing a client must not record each response twice
+        hooks = self.http_client.event_hooks
+        if _capture_usage not in hooks["response"]:
+            hooks["response"] = [*hooks["response"], _capture_usage]
+            self.http_client.event_hooks = hooks
+        self.client = instructor.from_openai(
+            # Transport retries are handled by call_with_retries, not the SDK
+            AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client, max_retries=0)
+        )
         self.extractor = ExtraCurricularExtractor()
+        self.regex_executor = regex_executor
+        self.save_raw_responses = save_raw_responses
+        self.text_extractor = text_extractor or PageTextExtractor()
+        self.scheduler = scheduler
+        self.model = model
+        self.cache = (cache or ExtractionCache()) if use_cache else None
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.prompt_cache = PromptCacheStats()
+        self.metrics = metrics or RunMetrics()
     
-    async def _extract_resume_info(self, text: str) -> Tuple[ResumeInfo, object]:
-        """Extract main resume information."""
-        response, completion = await asyncio.to_thread(
-            self.client.chat.completions.create_with_completion,
-            model="deepseek-chat",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are an expert resume parsing system. Extract the exact information mentioned in resumes into a structured JSON format. If any information is missing return NA. The output should match this structure exactly:\n\n{metadata: {name, gender, reg_no, dob, email, phone, mobile, branch, degree}, academic_performance: [{semester, duration, sgpa, cgpa, degree}], projects: [{name, company, duration, skill: {programming_languages: [], frameworks: [], databases: [], other_technologies: [], knowledge_area: []}}], technical_skills: {programming_languages: [], frameworks: [], databases: [], other_technologies: [], knowledge_area: []}}"
-                },
-                {
-                    "role": "user", 
-                    "content": f"Candidate resume:\n\n{text}"
-                },
-            ],
-            temperature=0.0,
-            response_model=ResumeInfo
+    async def _extract_resume_info(self, text: str) -> Tuple[ResumeInfo, CompletionUsage]:
+        """Extract main resume information.
+        
+        Results are served from the extraction cache when the same text was
+        already parsed with the same model, prompt and schema; cache hits
+        report zero token usage. Cache files are read and written on the
+        loop's default executor, off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(text, self.model, PROMPT_VERSION)
+            cached = await loop.run_in_executor(None, self.cache.get, cache_key)
+            if cached is not None:
+                return cached, CompletionUsage(completion_tokens=0, prompt_tokens=0, total_tokens=0)
+        
+        response, completion = await call_with_retries(
+            lambda: self._request(text),
+            self.retry_policy,
+            self.retry_stats,
+            on_retry_after=self.scheduler.pause if self.scheduler else None
         )
         
+        if cache_key is not None:
+            await loop.run_in_executor(None, self.cache.put, cache_key, response, self.model)
+        
+        return response, completion.usage
+
+    async def _request(self, text: str) -> Tuple[ResumeInfo, object]:
+        """Make one LLM attempt, waiting for a scheduler slot if configured."""
+        # instructor appends re-ask messages in place, so build them per attempt
+        messages = build_messages(text)
+        
+        if self.scheduler is None:
+            return await self._create_with_completion(messages)
+        
+        estimated = estimate_tokens(*(m["content"] for m in messages))
+        requested = time.perf_counter()
+        async with self.scheduler.slot(estimated):
+            waits = _slot_waits.get()
+            if waits is not None:
+                waits.append(time.perf_counter() - requested)
+            response, completion = await self._create_with_completion(messages)
+        self.scheduler.record_usage(estimated, completion.usage.total_tokens)
+        return response, completion
+
+    async def _create_with_completion(self, messages: list) -> Tuple[ResumeInfo, object]:
+        """Send a single structured-output request to the LLM."""
+        raw_usage = []
+        _response_usage.set(raw_usage)
+        response, completion = await asyncio.wait_for(
+            self.client.chat.completions.create_with_completion(
+                model=self.model,
+                messages=messages,
+                temperature=0.0,
+                response_model=ResumeInfo,
+                # Re-ask only on invalid output; API errors go to call_with_retries
+                max_retries=AsyncRetrying(
+                    stop=stop_after_attempt(3),
+                    retry=retry_if_exception_type(InstructorRetryException),
+                    reraise=True
+                )
+            ),
+            timeout=self.retry_policy.attempt_timeout
+        )
+        
+        # Restore the prompt cache hits that instructor's usage total drops
+        cached = sum(cached_prompt_tokens(usage) for usage in raw_usage)
+        completion.usage.prompt_tokens_details = PromptTokensDetails(cached_tokens=cached)
+        self.prompt_cache.record(completion.usage.prompt_tokens, cached)
+        
         # Parse the JSON response into ResumeInfo model
         #response_json = json.loads(completion.choices[0].message.content)
         #resume_info = response.model_dump()
         
         return response, completion
 
-    async def parse_resume(self, pdf_path: str) -> Tuple[ResumeInfo, ExtraCurricular, TokenUsage]:
+    async def aclose(self):
+        """Close the pooled HTTP connections."""
+        await self.http_client.aclose()
+
+    async def parse_resume(self, pdf: PdfSource, source_id: Optional[str] = None
+                           ) -> Tuple[ResumeInfo, ExtraCurricular, TokenUsage]:
         """Parse a resume PDF and extract structured information.
         
         Args:
-            pdf_path: Path to the resume PDF file
+            pdf: Path to the resume PDF, its bytes or a binary file object;
+                in-memory PDFs are read without touching disk
+            source_id: Identifier used in logs; defaults to the file name
             
         Returns:
             Tuple of (ResumeInfo, ExtraCurricular, TokenUsage)
         """
+        if source_id is None:
+            name = pdf if isinstance(pdf, (str, os.PathLike)) else getattr(pdf, "name", None)
+            source_id = Path(name).stem if isinstance(name, (str, os.PathLike)) else "upload"
+        
         # Read PDF and extract text
-        reader = PdfReader(pdf_path)
-        text = "\n".join([
-            re.sub(r'\s\s+', ' ', page.extract_text()) 
-            for page in reader.pages
-        ])
+        text = "\n".join(self.text_extractor.extract(pdf))
 
-        # Extract main resume info using LLM
-        resume_info, completion = await self._extract_resume_info(text)
+        return await self.parse_text(text, source_id)
+
+    async def _timed_extract_resume_info(self, text: str, source_id: str) -> Tuple[ResumeInfo, CompletionUsage]:
+        """Run the LLM extraction, recording its latency apart from slot waits."""
+        waits = []
+        _slot_waits.set(waits)
+        start = time.perf_counter()
+        try:
+            return await self._extract_resume_info(text)
+        finally:
+            waited = sum(waits)
+            self.metrics.record('llm', source_id, time.perf_counter() - start - waited, wait=waited)
+    
+    def _timed_extract_extra(self, text: str, source_id: str, submitted: float) -> ExtraCurricular:
+        """Run the pattern matching on the executor thread, recording its timing."""
+        with self.metrics.stage('regex', source_id, wait=time.perf_counter() - submitted):
+            return self.extractor.extract(text)
+    
+    async def parse_text(self, text: str, source_id: str) -> Tuple[ResumeInfo, ExtraCurricular, TokenUsage]:
+        """Parse already extracted resume text.
+        
+        Args:
+            text: Whitespace-normalised resume text, pages joined by newlines
+            source_id: Identifier of the resume the text came from (used in logs)
+            
+        Returns:
+            Tuple of (ResumeInfo, ExtraCurricular, TokenUsage)
+        """
+        # Extract main resume info using LLM while the CPU-bound pattern
+        # matching for extra-curricular info runs off the event loop
+        loop = asyncio.get_running_loop()
+        (resume_info, usage), extra_info = await asyncio.gather(
+            self._timed_extract_resume_info(text, source_id),
+            loop.run_in_executor(self.regex_executor, self._timed_extract_extra,
+                                 text, source_id, time.perf_counter())
+        )
+        print(f"Parsed {source_id}:")
         print(resume_info)
-        print(completion)
-        # Extract extra-curricular info using pattern matching
-        extra_info = self.extractor.extract(text)
+        print(usage)
         print('Extra-curricular info:')
         print(extra_info)
         # Create token usage info
         total_usage = TokenUsage.from_completion_usage(
             reg_no=resume_info.metadata.reg_no,
-            usage=completion.usage
+            usage=usage
         )
         
         # Save raw LLM response
-        output_dir = Path("data") / "raw_responses" / resume_info.metadata.reg_no
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_dir / "llm_response.json", "w") as f:
-            json.dump({
-                "response": resume_info.model_dump(),
-                "usage": {
-                    "completion_tokens": completion.usage.completion_tokens,
-                    "prompt_tokens": completion.usage.prompt_tokens,
-                    "total_tokens": completion.usage.total_tokens
-                }
-            }, f, indent=2)
+        if self.save_raw_responses:
+            save_raw_response(resume_info, usage)
         
         return resume_info, extra_info, total_usage 
\ No newline at end of file
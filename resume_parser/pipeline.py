@@ -0,0 +1,168 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Dict, Iterator, Optional, Tuple, TypeVar
+
+from .manifest import BatchManifest, content_hash, RUNNING, DONE, FAILED
+from .metrics import RunMetrics
+from .models import ResumeInfo, ExtraCurricular, ScoringProfile
+from .parser import ResumeParser
+from .utils import TokenUsage, calculate_candidate_score
+from .writer import ParsedResult, ResultWriter
+
+SKIPPED = "skipped"
+
+T = TypeVar('T')
+_END = object()
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of one resume leaving the pipeline."""
+    source_id: str
+    status: str  # DONE, FAILED or SKIPPED
+    scores: Optional[Dict[str, float]] = None
+    error: Optional[str] = None
+    resume_info: Optional[ResumeInfo] = None
+    extra_info: Optional[ExtraCurricular] = None
+    token_usage: Optional[TokenUsage] = None
+
+
+async def iter_in_thread(items: Iterator[T]) -> AsyncIterator[T]:
+    """Advance a blocking iterator on a dedicated thread.
+
+    Used for the PDF side of the pipeline (page extraction and boundary
+    detection), which is CPU and disk bound and must not stall the event
+    loop. Only one item is produced ahead of the consumer.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-source")
+    try:
+        while (item := await loop.run_in_executor(executor, next, items, _END)) is not _END:
+            yield item
+    finally:
+        # Queued behind any next() still running, so the generator is never
+        # closed while it executes
+        if hasattr(items, 'close'):
+            executor.submit(items.close)
+        executor.shutdown(wait=False)
+
+
+async def process_resume(parser: ResumeParser, source_id: str, text: str, writer: ResultWriter,
+                         manifest: Optional[BatchManifest] = None,
+                         profile: Optional[ScoringProfile] = None,
+                         metrics: Optional[RunMetrics] = None) -> PipelineResult:
+    """Parse, score and hand a single resume to the writer.
+
+    The resume is checkpointed as done once the writer has stored its chunk.
+    Checkpoints update the manifest in memory right away and are appended to
+    its file on the writer thread, so the event loop never waits on disk.
+
+    Args:
+        parser: Resume parser (LLM and pattern matching)
+        source_id: Identifier of the resume, e.g. the registration number
+        text: Extracted resume text
+        writer: Background result writer
+        manifest: Batch manifest to checkpoint progress in
+        profile: Scoring profile; the default profile if None
+        metrics: Receives the scoring time
+
+    Returns:
+        PipelineResult with the candidate's scores, or the error
+    """
+    metrics = metrics or RunMetrics()
+    text_hash = content_hash(text)
+
+    def checkpoint(status: str, error: Optional[str] = None):
+        if manifest is not None:
+            writer.defer(manifest.append, manifest.update(source_id, text_hash, status, error))
+
+    checkpoint(RUNNING)
+    try:
+        resume_info, extra_info, token_usage = await parser.parse_text(text, source_id)
+        with metrics.stage('score', source_id):
+            scores = calculate_candidate_score(resume_info, extra_info, profile)
+
+        # Queue the results for the writer; waits only if the writer is behind
+        on_stored = (lambda: checkpoint(DONE)) if manifest is not None else None
+        await writer.submit(ParsedResult(source_id, resume_info, extra_info, token_usage, on_stored))
+
+        print(f"Successfully parsed resume: {source_id}")
+        return PipelineResult(source_id, DONE, scores=scores, resume_info=resume_info,
+                              extra_info=extra_info, token_usage=token_usage)
+    except Exception as e:
+        checkpoint(FAILED, error=str(e))
+        print(f"Error processing resume {source_id}: {str(e)}")
+        return PipelineResult(source_id, FAILED, error=str(e))
+
+
+async def run_pipeline(resumes: AsyncIterable[Tuple[str, str]], parser: ResumeParser, writer: ResultWriter,
+                       manifest: Optional[BatchManifest] = None, incremental: bool = True,
+                       concurrency: int = 8, profile: Optional[ScoringProfile] = None,
+                       metrics: Optional[RunMetrics] = None) -> AsyncIterator[PipelineResult]:
+    """Stream resumes through parsing, scoring and writing.
+
+    ``resumes`` yields (filename, text) pairs, e.g. ``iter_in_thread(
+    splitter.iter_resumes())``. A feeder moves them into a bounded queue
+    that ``concurrency`` workers drain; each result is yielded as soon as its
+    resume is scored. Both queues are bounded, so a slow LLM or writer
+    pauses PDF extraction instead of letting resumes pile up in memory.
+
+    Args:
+        resumes: Async iterable of (filename, text) pairs
+        parser: Resume parser
+        writer: Background result writer
+        manifest: Batch manifest for checkpointing and incremental runs
+        incremental: Skip resumes the manifest records as done
+        concurrency: Number of resumes parsed at once
+        profile: Scoring profile; the default profile if None
+        metrics: Receives the time each resume waits for a worker, its
+            scoring time and the count of finished resumes
+
+    Yields:
+        PipelineResult per resume, in completion order
+    """
+    metrics = metrics or RunMetrics()
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+    async def feed():
+        async for filename, text in resumes:
+            source_id = Path(filename).stem
+            if incremental and manifest is not None and manifest.is_done(source_id, content_hash(text)):
+                await outbox.put(PipelineResult(source_id, SKIPPED))
+                continue
+            await inbox.put((source_id, text, time.perf_counter()))
+        for _ in range(concurrency):
+            await inbox.put(_END)
+
+    async def work():
+        while (item := await inbox.get()) is not _END:
+            source_id, text, queued_at = item
+            metrics.record('queue', source_id, 0.0, wait=time.perf_counter() - queued_at)
+            await outbox.put(await process_resume(parser, source_id, text, writer, manifest, profile, metrics))
+
+    tasks = [asyncio.create_task(feed())] + [asyncio.create_task(work()) for _ in range(concurrency)]
+
+    async def close():
+        # A failing source ends the stream with its exception
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            await outbox.put(e)
+        else:
+            await outbox.put(_END)
+
+    closer = asyncio.create_task(close())
+    try:
+        while (result := await outbox.get()) is not _END:
+            if isinstance(result, Exception):
+                raise result
+            metrics.completed(result.status)
+            yield result
+    finally:
+        for task in tasks + [closer]:
+            task.cancel()
+        await asyncio.gather(*tasks, closer, return_exceptions=True)
@@ -0,0 +1,52 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List
+
+# Static instructions. Keep this byte-identical between requests: providers
+# cache prompt prefixes, and any change here invalidates every cached prefix.
+SYSTEM_PROMPT = "You are an expert resume parsing system. Extract the exact information mentioned in resumes into a structured JSON format. If any information is missing return NA. The output should match this structure exactly:\n\n{metadata: {name, gender, reg_no, dob, email, phone, mobile, branch, degree}, academic_performance: [{semester, duration, sgpa, cgpa, degree}], projects: [{name, company, duration, skill: {programming_languages: [], frameworks: [], databases: [], other_technologies: [], knowledge_area: []}}], technical_skills: {programming_languages: [], frameworks: [], databases: [], other_technologies: [], knowledge_area: []}}"
+
+# Fixed lead-in of the user message, also part of the shared prefix
+USER_PREFIX = "Candidate resume:\n\n"
+
+# Identifies the prompt layout, e.g. in extraction cache keys
+PROMPT_VERSION = hashlib.sha256((SYSTEM_PROMPT + USER_PREFIX).encode()).hexdigest()[:16]
+
+
+def build_messages(text: str) -> List[Dict[str, str]]:
+    """Assemble the chat messages for one resume.
+
+    The static system block always comes first and the variable resume text
+    last, so consecutive requests share the longest possible identical
+    prefix and hit the provider's prompt cache.
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": USER_PREFIX + text},
+    ]
+
+
+def cached_prompt_tokens(usage: dict) -> int:
+    """Prompt tokens served from the provider's prefix cache.
+
+    OpenAI-compatible APIs report ``prompt_tokens_details.cached_tokens``;
+    DeepSeek reports ``prompt_cache_hit_tokens``.
+    """
+    details = usage.get("prompt_tokens_details") or {}
+    return details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0
+
+
+@dataclass
+class PromptCacheStats:
+    """Provider prompt-cache usage across a batch."""
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    def record(self, prompt_tokens: int, cached_tokens: int):
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of prompt tokens that were cache hits."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
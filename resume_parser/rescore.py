@@ -0,0 +1,119 @@
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .models import ScoringProfile
+from .scoring import Cohort, EXTRA_COLUMNS, PROJECT_SKILL_COLUMNS, SKILL_COLUMNS, score_cohort
+from .store import CohortStore
+
+
+def _count(cell: Optional[str]) -> int:
+    """Number of items in a ';'-joined CSV cell."""
+    return len([item for item in (cell or '').split(';') if item])
+
+
+def _read_rows(path: Path) -> List[Dict[str, str]]:
+    if not path.exists():
+        return []
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def load_cohort(parsed_dir: str = 'data/parsed_data',
+                raw_dir: str = 'data/raw_responses') -> Cohort:
+    """Load every previously parsed candidate as a cohort.
+
+    Academic records, projects and skills come from the raw LLM response in
+    ``raw_dir`` when one exists, falling back to the per-candidate CSVs in
+    ``parsed_dir``. Extra-curricular lists only exist in the CSVs.
+
+    Args:
+        parsed_dir: Directory with one ``{reg_no}`` folder of CSVs per candidate
+        raw_dir: Directory with ``{reg_no}/llm_response.json`` files
+
+    Returns:
+        Cohort of all candidates found in ``parsed_dir``
+    """
+    candidates, academic, projects = [], [], []
+
+    for i, candidate_dir in enumerate(sorted(p for p in Path(parsed_dir).iterdir() if p.is_dir())):
+        reg_no = candidate_dir.name
+        raw_file = Path(raw_dir) / reg_no / 'llm_response.json'
+        extra = _read_rows(candidate_dir / f'{reg_no}_extracurricular.csv')
+        extra = extra[0] if extra else {}
+
+        if raw_file.exists():
+            with open(raw_file) as f:
+                response = json.load(f)['response']
+            skills = {col: len(response['technical_skills'].get(col, [])) for col in SKILL_COLUMNS}
+            semesters = [(p['sgpa'], p['cgpa']) for p in response['academic_performance']]
+            project_rows = [
+                (p['company'], sum(len(p['skill'].get(col, [])) for col in PROJECT_SKILL_COLUMNS))
+                for p in response['projects']
+            ]
+        else:
+            skill_row = _read_rows(candidate_dir / f'{reg_no}_skills.csv')
+            skills = {col: _count(skill_row[0].get(col)) if skill_row else 0 for col in SKILL_COLUMNS}
+            semesters = [(row['sgpa'], row['cgpa']) for row in _read_rows(candidate_dir / f'{reg_no}_academic.csv')]
+            project_rows = [
+                (row['company'], sum(_count(row.get(col)) for col in PROJECT_SKILL_COLUMNS))
+                for row in _read_rows(candidate_dir / f'{reg_no}_projects.csv')
+            ]
+
+        row = {'reg_no': reg_no, **skills}
+        row.update({col: _count(extra.get(col)) for col in EXTRA_COLUMNS})
+        candidates.append(row)
+        academic.extend({'candidate': i, 'sgpa': float(sgpa), 'cgpa': float(cgpa)} for sgpa, cgpa in semesters)
+        projects.extend({'candidate': i, 'company': company, 'skills': n} for company, n in project_rows)
+
+    return Cohort.from_rows(candidates, academic, projects)
+
+
+def rescore(profile: Optional[ScoringProfile] = None, parsed_dir: str = 'data/parsed_data',
+            raw_dir: str = 'data/raw_responses', store_dir: Optional[str] = None) -> pd.DataFrame:
+    """Recompute scores for all parsed candidates without the PDF or the LLM.
+
+    Args:
+        profile: Weights and thresholds; the default profile if None
+        parsed_dir: Per-candidate CSV directory
+        raw_dir: Raw LLM response directory
+        store_dir: Cohort store to read instead of the per-candidate files
+
+    Returns:
+        Scores indexed by reg_no, best candidate first
+    """
+    cohort = CohortStore(store_dir).cohort() if store_dir else load_cohort(parsed_dir, raw_dir)
+    scores = score_cohort(cohort, profile)
+    return scores.sort_values('total_score', ascending=False, kind='stable')
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point: ``python -m resume_parser.rescore``."""
+    arg_parser = argparse.ArgumentParser(description='Re-score parsed candidates with a scoring profile.')
+    arg_parser.add_argument('--profile', help='JSON scoring profile; defaults are used for omitted fields')
+    arg_parser.add_argument('--parsed-dir', default='data/parsed_data')
+    arg_parser.add_argument('--raw-dir', default='data/raw_responses')
+    arg_parser.add_argument('--store', help='Cohort store directory, e.g. data/output/cohort; '
+                                            'read instead of --parsed-dir/--raw-dir')
+    arg_parser.add_argument('--output', default='data/rescored.csv', help='Where to write the ranked scores')
+    args = arg_parser.parse_args(argv)
+
+    profile = ScoringProfile.from_file(args.profile) if args.profile else ScoringProfile()
+
+    start = time.perf_counter()
+    scores = rescore(profile, args.parsed_dir, args.raw_dir, args.store)
+    elapsed = time.perf_counter() - start
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    scores.to_csv(args.output)
+    print(f"Re-scored {len(scores)} candidates in {elapsed:.2f}s, written to {args.output}")
+    print(scores.head(10).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+T = TypeVar("T")
+
+# Status codes worth another attempt; everything else is a permanent failure
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class RetryPolicy:
+    """How often and how long to retry a failed LLM request."""
+    max_attempts: int = 4
+    base_delay: float = 1.0      # seconds, doubled every attempt
+    max_delay: float = 30.0
+    attempt_timeout: Optional[float] = 120.0  # per request
+    total_timeout: Optional[float] = 600.0    # per resume, across all attempts
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt`` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class RetryStats:
+    """Per-resume retry outcomes for a batch."""
+    retried: int = 0    # resumes that needed at least one retry
+    timed_out: int = 0  # resumes that hit a per-attempt or overall deadline
+    failed: int = 0     # resumes that gave up (retries exhausted or permanent error)
+    retries: int = 0    # total retry attempts
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for timeouts, connection errors and 408/409/429/5xx responses."""
+    if isinstance(exc, (asyncio.TimeoutError, openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS
+    return False
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait, from the Retry-After header."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def call_with_retries(fn: Callable[[], Awaitable[T]], policy: RetryPolicy, stats: RetryStats,
+                            on_retry_after: Optional[Callable[[float], None]] = None) -> T:
+    """Await ``fn()`` until it succeeds, retrying transient failures.
+
+    Waits honour Retry-After when the provider sends it and fall back to
+    jittered exponential backoff. Each attempt is bounded by what remains of
+    ``policy.total_timeout``.
+
+    Args:
+        fn: Coroutine factory performing one attempt
+        policy: Retry limits and delays
+        stats: Counters updated with the outcome
+        on_retry_after: Called with the provider's requested delay, e.g. to
+            pause other requests sharing the same rate limit
+
+    Returns:
+        Result of the first successful attempt
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + policy.total_timeout if policy.total_timeout else None
+    timed_out = False
+
+    for attempt in range(1, policy.max_attempts + 1):
+        try:
+            if deadline is None:
+                return await fn()
+            return await asyncio.wait_for(fn(), max(0.0, deadline - loop.time()))
+        except Exception as exc:
+            if isinstance(exc, (asyncio.TimeoutError, openai.APITimeoutError)) and not timed_out:
+                timed_out = True
+                stats.timed_out += 1
+
+            requested = retry_after(exc)
+            delay = requested if requested is not None else policy.backoff(attempt)
+            out_of_time = deadline is not None and loop.time() + delay >= deadline
+            if not is_retryable(exc) or attempt == policy.max_attempts or out_of_time:
+                stats.failed += 1
+                raise
+
+            if requested is not None and on_retry_after is not None:
+                on_retry_after(requested)
+            if attempt == 1:
+                stats.retried += 1
+            stats.retries += 1
+            await asyncio.sleep(delay)
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+
+class TokenBucket:
+    """Refilling budget of ``capacity`` units per ``period`` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.available = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float):
+        """Wait until ``amount`` units are available and take them.
+
+        Requests larger than the capacity are clamped so they can still run.
+        Waiters are served in arrival order.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.available < amount:
+                await asyncio.sleep((amount - self.available) / self.rate)
+                self._refill()
+            self.available -= amount
+
+    def adjust(self, amount: float):
+        """Return (positive) or charge (negative) units after the fact."""
+        self._refill()
+        self.available = min(self.capacity, self.available + amount)
+
+
+class LLMScheduler:
+    """Bound in-flight LLM requests and keep them within provider rate limits.
+
+    Callers wrap each request in ``slot()``. A slot is granted when fewer than
+    ``max_in_flight`` requests are running and the requests-per-minute and
+    tokens-per-minute budgets allow it; otherwise the caller waits, which
+    applies backpressure to the batch instead of flooding the provider.
+    """
+
+    def __init__(self, max_in_flight: int = 8,
+                 requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
+        """Initialize the scheduler.
+
+        Args:
+            max_in_flight: Maximum number of concurrent requests
+            requests_per_minute: Request budget, unlimited if None
+            tokens_per_minute: Token budget (prompt + completion), unlimited if None
+        """
+        self.max_in_flight = max_in_flight
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._paused_until = 0.0
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """Hold one request slot, charging the estimated tokens up front."""
+        async with self._semaphore:
+            # Honour a provider-requested cooldown shared by all requests
+            while (delay := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            if self._requests:
+                await self._requests.acquire(1)
+            if self._tokens:
+                await self._tokens.acquire(estimated_tokens)
+
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def pause(self, seconds: float):
+        """Hold back new requests for ``seconds``, e.g. after a 429 with Retry-After."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once the real usage is known."""
+        if self._tokens:
+            self._tokens.adjust(estimated_tokens - actual_tokens)
+
+
+def estimate_tokens(*texts: str, completion_tokens: int = 1024) -> int:
+    """Rough token estimate (~4 characters per token) plus expected completion."""
+    return sum(len(text) for text in texts) // 4 + completion_tokens
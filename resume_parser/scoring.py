@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .models import ResumeInfo, ExtraCurricular, ScoringProfile
+
+__all__ = ['Cohort', 'score_cohort']
+
+SKILL_COLUMNS = ['programming_languages', 'frameworks', 'databases', 'other_technologies', 'knowledge_area']
+EXTRA_COLUMNS = ['leadership', 'awards', 'certifications', 'activities']
+# Skill lists counted towards a project's technical relevance
+PROJECT_SKILL_COLUMNS = ['programming_languages', 'frameworks', 'databases', 'knowledge_area']
+
+
+@dataclass
+class Cohort:
+    """Columnar view of N candidates for vectorised scoring.
+
+    Attributes:
+        candidates: One row per candidate, indexed by reg_no, with the number
+            of entries in each technical skill and extra-curricular list
+        academic: One row per semester with ``candidate`` (row position in
+            ``candidates``), ``sgpa`` and ``cgpa``
+        projects: One row per project with ``candidate``, ``company`` and
+            ``skills`` (number of languages, frameworks, databases and
+            knowledge areas used)
+    """
+    candidates: pd.DataFrame
+    academic: pd.DataFrame
+    projects: pd.DataFrame
+
+    @classmethod
+    def from_rows(cls, candidates: List[dict], academic: List[dict], projects: List[dict]) -> 'Cohort':
+        """Build a cohort from row dicts shaped like the three tables."""
+        return cls(
+            candidates=pd.DataFrame(candidates, columns=['reg_no'] + SKILL_COLUMNS + EXTRA_COLUMNS).set_index('reg_no'),
+            academic=pd.DataFrame(academic, columns=['candidate', 'sgpa', 'cgpa']),
+            projects=pd.DataFrame(projects, columns=['candidate', 'company', 'skills'])
+        )
+
+    @classmethod
+    def from_models(cls, results: Iterable[Tuple[ResumeInfo, ExtraCurricular]]) -> 'Cohort':
+        """Build a cohort from parsed resumes and their extra-curricular info."""
+        candidates, academic, projects = [], [], []
+
+        for i, (resume_info, extra_info) in enumerate(results):
+            row = {'reg_no': resume_info.metadata.reg_no}
+            row.update({col: len(getattr(resume_info.technical_skills, col)) for col in SKILL_COLUMNS})
+            row.update({col: len(getattr(extra_info, col)) for col in EXTRA_COLUMNS})
+            candidates.append(row)
+
+            academic.extend(
+                {'candidate': i, 'sgpa': float(p.sgpa), 'cgpa': float(p.cgpa)}
+                for p in resume_info.academic_performance
+            )
+            projects.extend(
+                {
+                    'candidate': i,
+                    'company': p.company,
+                    'skills': sum(len(getattr(p.skill, col)) for col in PROJECT_SKILL_COLUMNS)
+                }
+                for p in resume_info.projects
+            )
+
+        return cls.from_rows(candidates, academic, projects)
+
+
+def count_points(counts: np.ndarray, thresholds: List[int]) -> np.ndarray:
+    """Vectorised ``count_mapper``: one point per threshold reached."""
+    points = np.zeros(counts.shape, dtype=np.int64)
+    for threshold in thresholds:
+        points += counts >= threshold
+    return points
+
+
+def _group_sum(values: np.ndarray, group: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum ``values`` per group.
+
+    Returns:
+        Tuple of (sums, counts) per group
+    """
+    return np.bincount(group, weights=values, minlength=n_groups), np.bincount(group, minlength=n_groups)
+
+
+def _round(scores: np.ndarray) -> np.ndarray:
+    """Round each score with ``round(float(x), 2)``, as ``calculate_candidate_score`` does."""
+    return np.array([round(float(x), 2) for x in scores.tolist()])
+
+
+def score_cohort(cohort: Cohort, profile: Optional[ScoringProfile] = None) -> pd.DataFrame:
+    """Score every candidate in a cohort with array operations.
+
+    Produces the same 2-decimal values as ``calculate_candidate_score`` for
+    each candidate; both round with ``round(float(x), 2)``, so summation
+    order only matters in the last bits before rounding.
+
+    Args:
+        cohort: Columnar candidate data
+        profile: Weights and thresholds; the default profile if None
+
+    Returns:
+        DataFrame indexed by reg_no with total_score, academic_score,
+        technical_score, projects_score and extra_score columns
+    """
+    p = profile or ScoringProfile()
+    n = len(cohort.candidates)
+
+    # Academic: average CGPA and SGPA consistency, scaled to the academic weight
+    group = cohort.academic['candidate'].to_numpy(dtype=np.int64)
+    sgpa = cohort.academic['sgpa'].to_numpy(dtype=float)
+    cgpa_sum, semesters = _group_sum(cohort.academic['cgpa'].to_numpy(dtype=float), group, n)
+    sgpa_sum, _ = _group_sum(sgpa, group, n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_cgpa = cgpa_sum / semesters
+        deviation = sgpa - (sgpa_sum / semesters)[group]
+        squares_sum, _ = _group_sum(deviation * deviation, group, n)
+        std_dev = np.where(semesters > 1, np.sqrt(squares_sum / semesters), 0.0)
+    academic_raw = (avg_cgpa * p.cgpa_weight + (p.grade_scale - std_dev) * p.consistency_weight) \
+        * (p.academic_weight / p.grade_scale)
+    academic = np.where(semesters > 0, np.minimum(academic_raw, p.academic_weight), 0.0)
+
+    # Technical: count points per skill list
+    skills = cohort.candidates[SKILL_COLUMNS].to_numpy(dtype=np.int64)
+    technical_points = count_points(skills, p.count_thresholds).sum(axis=1)
+    technical = np.minimum((technical_points / p.technical_max_points) * p.technical_weight, p.technical_weight)
+
+    # Projects: base, internship bonus and capped relevance points
+    companies = cohort.projects['company'].astype(str).str.lower()
+    internship = ~companies.isin(p.non_internship_companies).to_numpy(dtype=bool)
+    skill_points = count_points(cohort.projects['skills'].to_numpy(dtype=np.int64), p.count_thresholds)
+    relevance = np.minimum(skill_points * p.relevance_multiplier, p.relevance_cap)
+    project_points = p.project_base_points + p.internship_bonus * internship + relevance
+    total_points = np.bincount(
+        cohort.projects['candidate'].to_numpy(dtype=np.int64), weights=project_points, minlength=n
+    )
+    projects = np.minimum((total_points / p.projects_max_points) * p.projects_weight, p.projects_weight)
+
+    # Extra-curricular: count points over all activity lists
+    extra_counts = cohort.candidates[EXTRA_COLUMNS].to_numpy(dtype=np.int64).sum(axis=1)
+    extra_points = count_points(extra_counts, p.count_thresholds)
+    extra = np.minimum((extra_points / p.extra_max_points) * p.extra_weight, p.extra_weight)
+
+    total = academic + technical + projects + extra
+
+    return pd.DataFrame({
+        'total_score': _round(total),
+        'academic_score': _round(academic),
+        'technical_score': _round(technical),
+        'projects_score': _round(projects),
+        'extra_score': _round(extra)
+    }, index=cohort.candidates.index)
@@ -0,0 +1,214 @@
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .models import ResumeInfo, ExtraCurricular, ScoringProfile
+from .scoring import Cohort, PROJECT_SKILL_COLUMNS, score_cohort
+
+SCORE_COLUMNS = ['total_score', 'academic_score', 'technical_score', 'projects_score', 'extra_score']
+SKILL_FIELDS = ['programming_languages', 'frameworks', 'databases', 'other_technologies', 'knowledge_area']
+EXTRA_FIELDS = ['leadership', 'awards', 'certifications', 'activities', 'languages']
+
+_strings = pa.list_(pa.string())
+
+# Explicit schemas keep every part readable as one dataset, even when a
+# chunk has no values for a column. Rows are keyed by the pipeline's
+# source_id; reg_no is whatever the LLM read and need not be unique.
+_key = [('source_id', pa.string()), ('reg_no', pa.string())]
+SCHEMAS = {
+    'metadata': pa.schema(
+        [('source_id', pa.string())]
+        + [(name, pa.string()) for name in ResumeInfo.model_fields['metadata'].annotation.model_fields]
+        + [(name, pa.float64()) for name in SCORE_COLUMNS]
+    ),
+    'academic': pa.schema(_key + [
+        ('semester', pa.int64()), ('duration', pa.string()),
+        ('sgpa', pa.float64()), ('cgpa', pa.float64()), ('degree', pa.string())
+    ]),
+    'skills': pa.schema(_key + [(name, _strings) for name in SKILL_FIELDS]),
+    'projects': pa.schema(
+        _key + [('name', pa.string()), ('company', pa.string()), ('duration', pa.string())]
+        + [(name, _strings) for name in SKILL_FIELDS]
+    ),
+    'extracurricular': pa.schema(_key + [(name, _strings) for name in EXTRA_FIELDS]),
+}
+
+_PART_PATTERN = re.compile(r'part-(\d+)\.parquet$')
+
+
+class CohortStore:
+    """Cohort-level columnar tables of parsed candidates, stored as Parquet.
+
+    Candidates are buffered and written in chunks, one part file per table
+    per chunk under ``<root>/<table>/part-NNNNN.parquet``. The metadata part
+    is written last, so a chunk counts as stored only once its metadata is
+    on disk. Candidates are identified by their source_id (the resume the
+    pipeline read, the parsed reg_no by default), since the LLM may return
+    the same reg_no, e.g. "NA", for different resumes. A candidate stored
+    again replaces its earlier rows: within a chunk only its last version is
+    written, and a later chunk wins when reading.
+
+    Part numbers continue from the parts on disk when the store is opened,
+    so a directory must have a single store writing to it; share that store
+    between threads (adding and flushing are locked) rather than opening a
+    second one.
+    """
+
+    TABLES = ('academic', 'skills', 'projects', 'extracurricular', 'metadata')
+
+    def __init__(self, root: str, chunk_size: int = 500, profile: Optional[ScoringProfile] = None):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding one sub-directory per table
+            chunk_size: Number of candidates buffered before writing a part
+            profile: Scoring profile used for the metadata scores
+        """
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+        self.profile = profile
+        self._pending: List[Tuple[str, ResumeInfo, ExtraCurricular, Optional[Callable[[], None]]]] = []
+        self._lock = threading.RLock()
+        self._next_part = max(
+            (int(m.group(1)) + 1 for table in self.TABLES for m in self._parts(table)),
+            default=0
+        )
+
+    def _parts(self, table: str) -> List[re.Match]:
+        table_dir = self.root / table
+        if not table_dir.exists():
+            return []
+        matches = (_PART_PATTERN.search(name) for name in os.listdir(table_dir))
+        return sorted((m for m in matches if m), key=lambda m: int(m.group(1)))
+
+    def add(self, resume_info: ResumeInfo, extra_info: ExtraCurricular,
+            on_stored: Optional[Callable[[], None]] = None, source_id: Optional[str] = None):
+        """Buffer a candidate, writing a chunk once ``chunk_size`` are pending.
+
+        Args:
+            resume_info: Parsed resume
+            extra_info: Extra-curricular info from pattern matching
+            on_stored: Called once the candidate's chunk is on disk, e.g. to
+                checkpoint it as done
+            source_id: Identifier of the resume; the parsed reg_no if None
+        """
+        with self._lock:
+            self._pending.append((source_id or resume_info.metadata.reg_no, resume_info, extra_info, on_stored))
+            if len(self._pending) >= self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Write all pending candidates as one part per table."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            # A candidate added twice in one chunk keeps only its last version
+            latest = {source_id: (resume_info, extra_info) for source_id, resume_info, extra_info, _ in pending}
+            pairs = list(latest.values())
+            scores = score_cohort(Cohort.from_models(pairs), self.profile)
+
+            rows: Dict[str, List[dict]] = {table: [] for table in self.TABLES}
+            for source_id, (resume_info, extra_info), score in zip(latest, pairs, scores.to_dict('records')):
+                key = {'source_id': source_id, 'reg_no': resume_info.metadata.reg_no}
+                rows['metadata'].append({'source_id': source_id, **resume_info.metadata.model_dump(), **score})
+                rows['academic'].extend({**key, **p.model_dump()} for p in resume_info.academic_performance)
+                rows['skills'].append({**key, **resume_info.technical_skills.model_dump()})
+                rows['projects'].extend(
+                    {**key, 'name': p.name, 'company': p.company, 'duration': p.duration, **p.skill.model_dump()}
+                    for p in resume_info.projects
+                )
+                rows['extracurricular'].append({**key, **extra_info.model_dump()})
+
+            part = self._next_part
+            self._next_part += 1
+            for table in self.TABLES:
+                self._write_part(table, part, pa.Table.from_pylist(rows[table], schema=SCHEMAS[table]))
+
+            for _, _, _, on_stored in pending:
+                if on_stored is not None:
+                    on_stored()
+
+    def _write_part(self, table: str, part: int, data: pa.Table):
+        table_dir = self.root / table
+        table_dir.mkdir(parents=True, exist_ok=True)
+        path = table_dir / f'part-{part:05d}.parquet'
+        tmp_path = table_dir / f'.{path.name}.tmp'  # hidden from dataset readers until complete
+        pq.write_table(data, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _read_parts(self, table: str, parts: set) -> pd.DataFrame:
+        frames = []
+        for m in self._parts(table):
+            if int(m.group(1)) in parts:
+                frame = pq.read_table(self.root / table / m.group(0)).to_pandas()
+                if 'source_id' not in frame:  # written before rows carried a source_id
+                    frame.insert(0, 'source_id', frame['reg_no'])
+                frames.append(frame.assign(_part=int(m.group(1))))
+        if not frames:
+            return SCHEMAS[table].empty_table().to_pandas().assign(_part=pd.Series(dtype='int64'))
+        return pd.concat(frames, ignore_index=True)
+
+    def read(self, table: str) -> pd.DataFrame:
+        """Return the stored rows of ``table``, latest version of each candidate only."""
+        metadata = self._read_parts('metadata', {int(m.group(1)) for m in self._parts('metadata')})
+        latest = metadata.groupby('source_id')['_part'].max()
+
+        data = metadata if table == 'metadata' else self._read_parts(table, set(latest))
+        data = data[data['_part'] == data['source_id'].map(latest)]
+        return data.drop(columns='_part').reset_index(drop=True)
+
+    def cohort(self) -> Cohort:
+        """Load all stored candidates as a Cohort for re-scoring."""
+        metadata = self.read('metadata')
+        position = pd.Series(range(len(metadata)), index=metadata['source_id'])
+
+        skills = self.read('skills').set_index('source_id').reindex(metadata['source_id'])
+        extra = self.read('extracurricular').set_index('source_id').reindex(metadata['source_id'])
+        counts = {col: skills[col].map(len).to_numpy() for col in SKILL_FIELDS}
+        counts.update({col: extra[col].map(len).to_numpy() for col in EXTRA_FIELDS if col != 'languages'})
+        candidates = pd.DataFrame(counts, index=pd.Index(metadata['reg_no'], name='reg_no'))
+
+        academic = self.read('academic')
+        projects = self.read('projects')
+        return Cohort(
+            candidates=candidates,
+            academic=pd.DataFrame({
+                'candidate': academic['source_id'].map(position).to_numpy(),
+                'sgpa': academic['sgpa'],
+                'cgpa': academic['cgpa']
+            }),
+            projects=pd.DataFrame({
+                'candidate': projects['source_id'].map(position).to_numpy(),
+                'company': projects['company'],
+                'skills': sum(projects[col].map(len) for col in PROJECT_SKILL_COLUMNS)
+            })
+        )
+
+    def export_csv(self, output_dir: Path):
+        """Write the per-candidate CSV layout of ``save_resume_data`` from the store."""
+        tables = {table: self.read(table) for table in self.TABLES}
+        for frame in tables.values():
+            for col in frame.columns:
+                if col in SKILL_FIELDS or col in EXTRA_FIELDS:
+                    frame[col] = frame[col].map(';'.join)
+        groups = {table: dict(list(frame.groupby('source_id', sort=False))) for table, frame in tables.items()}
+
+        for source_id, reg_no in zip(tables['metadata']['source_id'], tables['metadata']['reg_no']):
+            base_dir = Path(output_dir) / "parsed_data" / reg_no
+            os.makedirs(base_dir, exist_ok=True)
+            for table in self.TABLES:
+                rows = groups[table].get(source_id)
+                if rows is None:
+                    rows = pd.DataFrame([])  # what save_resume_data writes for an empty list
+                elif table == 'metadata':
+                    rows = rows.drop(columns='source_id')
+                else:
+                    rows = rows.drop(columns=['source_id', 'reg_no'])
+                rows.to_csv(base_dir / f"{reg_no}_{table}.csv", index=False)
@@ -0,0 +1,176 @@
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pypdf import PdfReader
+
+# A path, the raw bytes or a binary file-like object such as an upload
+PdfSource = Union[str, os.PathLike, bytes, BinaryIO]
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace in extracted page text."""
+    return re.sub(r'\s\s+', ' ', text)
+
+
+def read_source(source: PdfSource) -> Union[str, bytes]:
+    """Return a path string or the PDF bytes for ``source``.
+
+    File-like objects are read into memory from the start, so uploads never
+    have to be written to disk.
+    """
+    if isinstance(source, bytes):
+        return source
+    if hasattr(source, 'read'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return source.read()
+    return os.fspath(source)
+
+
+def open_pdf(source: PdfSource) -> PdfReader:
+    """Open a PdfReader on a path, bytes or file-like object."""
+    source = read_source(source)
+    if isinstance(source, bytes):
+        return PdfReader(BytesIO(source))
+    return PdfReader(source)
+
+
+def _extract_range(source: PdfSource, start: int, stop: int) -> List[Tuple[str, float]]:
+    """Extract normalised text for pages [start, stop). Runs in a worker process.
+
+    Returns:
+        (text, CPU seconds) per page; opening the PDF counts towards the first page
+    """
+    cpu = time.process_time()
+    reader = open_pdf(source)
+    pages = []
+    for num in range(start, stop):
+        text = normalize_text(reader.pages[num].extract_text())
+        now = time.process_time()
+        pages.append((text, now - cpu))
+        cpu = now
+    return pages
+
+
+def _timed_texts(reader: PdfReader, nums: Iterable[int]) -> Iterator[Tuple[str, float]]:
+    """Extract normalised text for ``nums`` in the calling thread, with its CPU seconds."""
+    for num in nums:
+        cpu = time.thread_time()
+        text = normalize_text(reader.pages[num].extract_text())
+        yield text, time.thread_time() - cpu
+
+
+class PageTextExtractor:
+    """Extract page text from a PDF, sharding page ranges across processes.
+
+    pypdf's ``extract_text`` is pure Python and CPU bound, so threads do not
+    help. Large PDFs are split into shards of ``pages_per_shard`` pages, each
+    worker opens the PDF itself and extracts its shard, and the page texts are
+    returned in page order. Small PDFs (a single shard) are extracted in the
+    calling process to avoid the pool start-up cost.
+
+    Only a few shards per worker are in flight at a time, so iterating over a
+    very large PDF keeps memory flat. Workers are spawned rather than forked,
+    since the pool is often created from a worker thread (see
+    ``pipeline.iter_in_thread``) and forking a threaded process is unsafe.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, pages_per_shard: int = 16,
+                 shards_in_flight: int = 2):
+        """Initialize the extractor.
+
+        Args:
+            max_workers: Size of the process pool. Defaults to the CPU count;
+                1 disables the pool.
+            pages_per_shard: Number of consecutive pages handed to a worker
+            shards_in_flight: Shards submitted ahead per worker while iterating
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_shard = pages_per_shard
+        self.shards_in_flight = shards_in_flight
+
+    def iter_pages(self, source: PdfSource, reader: Optional[PdfReader] = None) -> Iterator[str]:
+        """Yield normalised page texts in page order; see iter_timed_pages()."""
+        with closing(self.iter_timed_pages(source, reader)) as pages:
+            for text, _ in pages:
+                yield text
+
+    def iter_timed_pages(self, source: PdfSource,
+                         reader: Optional[PdfReader] = None) -> Iterator[Tuple[str, float]]:
+        """Yield normalised page texts in page order, with the CPU time spent on each.
+
+        CPU time is measured where the page is extracted, so it covers pypdf
+        in the worker processes as well; the consuming thread's own CPU time
+        stays near zero when the pool does the work.
+
+        Args:
+            source: Path to the PDF, its raw bytes or a binary file object
+            reader: Already opened reader for ``source``, reused for in-process
+                extraction. Without one, in-process extraction opens a fresh
+                reader per shard so pypdf's object cache does not grow with
+                the PDF.
+
+        Yields:
+            (whitespace-normalised text, CPU seconds) of each page
+        """
+        source = read_source(source)
+        shared_reader = reader is not None
+        reader = reader or open_pdf(source)
+        num_pages = len(reader.pages)
+        shards = [
+            (start, min(start + self.pages_per_shard, num_pages))
+            for start in range(0, num_pages, self.pages_per_shard)
+        ]
+
+        if len(shards) <= 1 or (self.max_workers == 1 and shared_reader):
+            yield from _timed_texts(reader, range(num_pages))
+            return
+
+        if self.max_workers == 1:
+            del reader
+            for start, stop in shards:
+                yield from _timed_texts(open_pdf(source), range(start, stop))
+            return
+
+        if not isinstance(source, bytes):
+            yield from self._iter_shards(source, shards)
+            return
+
+        # Workers read in-memory PDFs from a private temp file rather than
+        # each task receiving a pickled copy of the whole document
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(source)
+            yield from self._iter_shards(path, shards)
+        finally:
+            os.remove(path)
+
+    def _iter_shards(self, path: str, shards: List[Tuple[int, int]]) -> Iterator[Tuple[str, float]]:
+        """Extract shards in a process pool, a bounded number in flight."""
+        workers = min(self.max_workers, len(shards))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            remaining = iter(shards)
+            pending = deque()
+            for start, stop in remaining:
+                pending.append(executor.submit(_extract_range, path, start, stop))
+                if len(pending) >= workers * self.shards_in_flight:
+                    break
+            while pending:
+                pages = pending.popleft().result()
+                for start, stop in remaining:
+                    pending.append(executor.submit(_extract_range, path, start, stop))
+                    break
+                yield from pages
+
+    def extract(self, source: PdfSource, reader: Optional[PdfReader] = None) -> List[str]:
+        """Return the normalised text of every page, in page order."""
+        return list(self.iter_pages(source, reader))
@@ -1,14 +1,18 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from typing import Optional, Dict, List
 import csv
+import json
 import os
 import numpy as np
 import pandas as pd
 from pathlib import Path
 
-from .models import ResumeInfo, ExtraCurricular
+from .models import ResumeInfo, ExtraCurricular, ScoringProfile
 
-__all__ = ['TokenUsage', 'save_resume_data', 'calculate_candidate_score']
+__all__ = ['TokenUsage', 'TokenPricing', 'TokenLedger', 'save_resume_data', 'calculate_candidate_score']
+
+DEFAULT_PROFILE = ScoringProfile()
 
 @dataclass
 class TokenUsage:
@@ -29,13 +33,120 @@ class TokenUsage:
             completion_tokens=usage.completion_tokens,
             prompt_tokens=usage.prompt_tokens,
             total_tokens=usage.total_tokens,
-            cached_tokens=usage.prompt_tokens_details.cached_tokens,
+            cached_tokens=usage.prompt_tokens_details.cached_tokens if usage.prompt_tokens_details else 0,
             audio_tokens=0,   # Not applicable
             reasoning_tokens=0  # Not applicable
         )
 
-def calculate_academic_score(academic_performance: List[dict]) -> float:
+@dataclass
+class TokenPricing:
+    """LLM prices in USD per million tokens, used for cost estimates.
+    
+    Defaults are deepseek-chat list prices; check the provider's current
+    pricing before relying on the estimate.
+    """
+    prompt: float = 0.27          # input tokens, cache miss
+    cached_prompt: float = 0.07   # input tokens served from the prompt cache
+    completion: float = 1.10
+    
+    def cost(self, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> float:
+        """Estimated cost in USD."""
+        return (
+            (prompt_tokens - cached_tokens) * self.prompt +
+            cached_tokens * self.cached_prompt +
+            completion_tokens * self.completion
+        ) / 1_000_000
+
+class TokenLedger:
+    """Collect token usage across a batch and persist it append-only.
+    
+    ``record`` only buffers in memory; ``flush`` appends the buffered records
+    to a JSON-lines file in one write, so callers control when disk I/O
+    happens. Every record carries the batch id, so one ledger file can hold
+    many batches.
+    """
+    
+    PERCENTILES = (50, 90, 99)
+    
+    def __init__(self, path: Optional[Path] = None, pricing: Optional[TokenPricing] = None,
+                 batch_id: Optional[str] = None):
+        """Initialize the ledger.
+        
+        Args:
+            path: JSON-lines file to append to; records are kept in memory only if None
+            pricing: Prices for cost estimates
+            batch_id: Identifier of this batch; defaults to the start time
+        """
+        self.path = Path(path) if path else None
+        self.pricing = pricing or TokenPricing()
+        self.batch_id = batch_id or datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        self.records: List[dict] = []
+        self._unflushed = 0
+    
+    def record(self, usage: TokenUsage):
+        """Add one resume's token usage to the batch."""
+        self.records.append({
+            'batch_id': self.batch_id,
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            **asdict(usage)
+        })
+        self._unflushed += 1
+    
+    def flush(self):
+        """Append records not yet written to the ledger file."""
+        if self.path is None or not self._unflushed:
+            return
+        lines = ''.join(json.dumps(r) + '\n' for r in self.records[-self._unflushed:])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(lines)
+        self._unflushed = 0
+    
+    def summary(self, records: Optional[List[dict]] = None) -> Dict[str, float]:
+        """Totals, per-resume percentiles and estimated cost.
+        
+        Resumes with zero usage were served from the extraction cache; they
+        count towards ``resumes`` but not towards the percentiles.
+        
+        Args:
+            records: Records to summarise; this batch's records if None
+        """
+        records = self.records if records is None else records
+        prompt = sum(r['prompt_tokens'] for r in records)
+        cached = sum(r['cached_tokens'] for r in records)
+        completion = sum(r['completion_tokens'] for r in records)
+        per_resume = [r['total_tokens'] for r in records if r['total_tokens']]
+        
+        summary = {
+            'resumes': len(records),
+            'llm_calls': len(per_resume),
+            'prompt_tokens': prompt,
+            'cached_tokens': cached,
+            'completion_tokens': completion,
+            'total_tokens': prompt + completion,
+            'cache_hit_ratio': cached / prompt if prompt else 0.0,
+            'estimated_cost': self.pricing.cost(prompt, cached, completion)
+        }
+        percentiles = np.percentile(per_resume, self.PERCENTILES) if per_resume else [0.0] * len(self.PERCENTILES)
+        for q, value in zip(self.PERCENTILES, percentiles):
+            summary[f'p{q}_tokens'] = float(value)
+        return summary
+    
+    @classmethod
+    def load(cls, path: Path) -> List[dict]:
+        """Read all records from a ledger file, e.g. to summarise several batches."""
+        records = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # partially written line from a crash
+        return records
+
+def calculate_academic_score(academic_performance: List[dict], profile: Optional[ScoringProfile] = None) -> float:
     """Calculate academic score (20% of total)."""
+    profile = profile or DEFAULT_PROFILE
     if not academic_performance:
         return 0.0
     
@@ -48,84 +159,90 @@ def calculate_academic_score(academic_performance: List[dict]) -> float:
     std_dev = np.std(sgpas) if len(sgpas) > 1 else 0
     
     # Calculate score using formula
-    score = (avg_cgpa * 0.75) + ((10 - std_dev) * 0.25)
+    score = (avg_cgpa * profile.cgpa_weight) + ((profile.grade_scale - std_dev) * profile.consistency_weight)
     
     # Normalize to 20%
-    return min(score * 2, 20.0)  # Multiply by 2 to scale to 20%
+    return min(score * (profile.academic_weight / profile.grade_scale), profile.academic_weight)
 
-def count_mapper(num_skills: int) -> int:
+def count_mapper(num_skills: int, profile: Optional[ScoringProfile] = None) -> int:
     """Map number of skills to points."""
-    if num_skills == 0:
-        return 0
-    elif num_skills <=3:
-        return 1
-    else:
-        return 2
+    # With the default thresholds: 0 for none, 1 for up to 3, 2 for more
+    thresholds = (profile or DEFAULT_PROFILE).count_thresholds
+    return sum(num_skills >= threshold for threshold in thresholds)
 
-def calculate_technical_score(technical_skills: dict) -> float:
+def calculate_technical_score(technical_skills: dict, profile: Optional[ScoringProfile] = None) -> float:
     """Calculate technical skills score (35% of total)."""
+    profile = profile or DEFAULT_PROFILE
     # Calculate raw points
     points = (
-        count_mapper(len(technical_skills['programming_languages'])) +
-        count_mapper(len(technical_skills['frameworks'])) +
-        count_mapper(len(technical_skills['databases'])) +
-        count_mapper(len(technical_skills['other_technologies'])) +
-        count_mapper(len(technical_skills['knowledge_area']))
+        count_mapper(len(technical_skills['programming_languages']), profile) +
+        count_mapper(len(technical_skills['frameworks']), profile) +
+        count_mapper(len(technical_skills['databases']), profile) +
+        count_mapper(len(technical_skills['other_technologies']), profile) +
+        count_mapper(len(technical_skills['knowledge_area']), profile)
     )
     
-    max_expected_points = 10
     # Normalize to 35%
-    normalized_score = (points / max_expected_points) * 35
+    normalized_score = (points / profile.technical_max_points) * profile.technical_weight
     
-    return min(normalized_score, 35.0)
+    return min(normalized_score, profile.technical_weight)
 
-def calculate_projects_score(projects: List[dict]) -> float:
+def calculate_projects_score(projects: List[dict], profile: Optional[ScoringProfile] = None) -> float:
     """Calculate projects score (30% of total)."""
+    profile = profile or DEFAULT_PROFILE
     total_points = 0
     
     for project in projects:
         # Base points for project
-        points = 5
+        points = profile.project_base_points
         
         # Additional points for internships
-        if project['company'].lower() not in ['personal', 'na', 'n/a']:
-            points += 5  # Additional points for internship
+        if project['company'].lower() not in profile.non_internship_companies:
+            points += profile.internship_bonus  # Additional points for internship
         
         # Points for technical relevance based on skills used
         skill_points = count_mapper(
             len(project['skill']['programming_languages']) +
             len(project['skill']['frameworks']) +
             len(project['skill']['databases']) +
-            len(project['skill']['knowledge_area'])
+            len(project['skill']['knowledge_area']),
+            profile
         )
-        relevance_points = min(skill_points*2, 10)  # Cap at 5 points
+        relevance_points = min(skill_points * profile.relevance_multiplier, profile.relevance_cap)
         
         total_points += points + relevance_points
     
     # Normalize to 30%
-    max_expected_points = 100  # Adjust this
-    normalized_score = (total_points / max_expected_points) * 30
+    normalized_score = (total_points / profile.projects_max_points) * profile.projects_weight
     
-    return min(normalized_score, 30.0)
+    return min(normalized_score, profile.projects_weight)
 
-def calculate_extracurricular_score(extra_curricular: dict) -> float:
+def calculate_extracurricular_score(extra_curricular: dict, profile: Optional[ScoringProfile] = None) -> float:
     """Calculate extracurricular score (15% of total)."""
+    profile = profile or DEFAULT_PROFILE
     # Calculate raw points using formula
     points = count_mapper(
         len(extra_curricular['leadership']) +
         len(extra_curricular['awards']) +
         len(extra_curricular['certifications']) +
-        len(extra_curricular['activities'])
+        len(extra_curricular['activities']),
+        profile
     )
     
     # Normalize to 15%
-    max_expected_points = 8  # Adjust this
-    normalized_score = (points / max_expected_points) * 15
+    normalized_score = (points / profile.extra_max_points) * profile.extra_weight
     
-    return min(normalized_score, 15.0)
+    return min(normalized_score, profile.extra_weight)
 
-def calculate_candidate_score(resume_info: ResumeInfo, extra_info: ExtraCurricular) -> Dict[str, float]:
-    """Calculate overall candidate score and component scores."""
+def calculate_candidate_score(resume_info: ResumeInfo, extra_info: ExtraCurricular,
+                              profile: Optional[ScoringProfile] = None) -> Dict[str, float]:
+    """Calculate overall candidate score and component scores.
+    
+    Args:
+        resume_info: Parsed resume
+        extra_info: Extra-curricular info from pattern matching
+        profile: Weights and thresholds; the default profile if None
+    """
     
     # Convert to dictionaries for easier handling
     academic_data = [p.model_dump() for p in resume_info.academic_performance]
@@ -134,22 +251,39 @@ def calculate_candidate_score(resume_info: ResumeInfo, extra_info: ExtraCurricul
     extra_data = extra_info.model_dump()
     
     # Calculate component scores
-    academic_score = calculate_academic_score(academic_data)
-    technical_score = calculate_technical_score(technical_data)
-    projects_score = calculate_projects_score(projects_data)
-    extra_score = calculate_extracurricular_score(extra_data)
+    academic_score = calculate_academic_score(academic_data, profile)
+    technical_score = calculate_technical_score(technical_data, profile)
+    projects_score = calculate_projects_score(projects_data, profile)
+    extra_score = calculate_extracurricular_score(extra_data, profile)
     
     # Calculate total score
     total_score = academic_score + technical_score + projects_score + extra_score
     
     return {
-        'total_score': round(total_score, 2),
-        'academic_score': round(academic_score, 2),
-        'technical_score': round(technical_score, 2),
-        'projects_score': round(projects_score, 2),
-        'extra_score': round(extra_score, 2)
+        'total_score': round(float(total_score), 2),
+        'academic_score': round(float(academic_score), 2),
+        'technical_score': round(float(technical_score), 2),
+        'projects_score': round(float(projects_score), 2),
+        'extra_score': round(float(extra_score), 2)
     }
 
+def save_raw_response(resume_info: ResumeInfo, usage, output_dir: Path = Path("data") / "raw_responses") -> Path:
+    """Save the raw LLM response and its token usage as JSON and return the file path."""
+    base_dir = output_dir / resume_info.metadata.reg_no
+    base_dir.mkdir(parents=True, exist_ok=True)
+    
+    path = base_dir / "llm_response.json"
+    with open(path, "w") as f:
+        json.dump({
+            "response": resume_info.model_dump(),
+            "usage": {
+                "completion_tokens": usage.completion_tokens,
+                "prompt_tokens": usage.prompt_tokens,
+                "total_tokens": usage.total_tokens
+            }
+        }, f, indent=2)
+    return path
+
 def save_resume_data(resume_info: ResumeInfo, extra_info: ExtraCurricular, output_dir: Path) -> Dict[str, str]:
     """Save resume data to CSV files and return file paths."""
     reg_no = resume_info.metadata.reg_no
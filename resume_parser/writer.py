@@ -0,0 +1,161 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .metrics import RunMetrics
+from .models import ResumeInfo, ExtraCurricular
+from .store import CohortStore
+from .utils import TokenLedger, TokenUsage, save_raw_response, save_resume_data
+
+
+@dataclass
+class ParsedResult:
+    """A parsed resume waiting to be written."""
+    source_id: str
+    resume_info: ResumeInfo
+    extra_info: ExtraCurricular
+    token_usage: TokenUsage
+    on_stored: Optional[Callable[[], None]] = None  # called on the event loop once durable
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
+_CLOSE = object()
+
+
+class ResultWriter:
+    """Write parsed results on a background thread, off the event loop.
+
+    Producers ``await submit(result)``; a consumer task drains the queue in
+    batches and hands each batch to a dedicated writer thread, which saves
+    the raw response, adds the candidate to the cohort store, records its
+    token usage in the ledger and optionally writes the per-candidate CSVs.
+    The queue is bounded, so when the disk falls behind, ``submit`` waits
+    instead of buffering results without limit. Other small writes, such as
+    manifest checkpoints, can be handed to the same thread with ``defer``.
+    ``close()`` drains the queue and flushes the store.
+
+    Usage::
+
+        async with ResultWriter(store) as writer:
+            await writer.submit(result)
+    """
+
+    def __init__(self, store: CohortStore, csv_output_dir: Optional[Path] = None,
+                 raw_response_dir: Optional[Path] = Path("data") / "raw_responses",
+                 ledger: Optional[TokenLedger] = None, max_pending: int = 256, batch_size: int = 32,
+                 metrics: Optional[RunMetrics] = None):
+        """Initialize the writer.
+
+        Args:
+            store: Cohort store receiving every result
+            csv_output_dir: Also write per-candidate CSVs under this directory if set
+            raw_response_dir: Directory for raw LLM responses; not saved if None
+            ledger: Token ledger, appended to after every batch
+            max_pending: Maximum number of results queued before ``submit`` waits
+            batch_size: Maximum number of results handed to the thread at once
+            metrics: Receives each result's write time and queue wait. A
+                result that fills a store chunk carries the chunk's write.
+        """
+        self.store = store
+        self.csv_output_dir = csv_output_dir
+        self.raw_response_dir = raw_response_dir
+        self.ledger = ledger
+        self.batch_size = batch_size
+        self.metrics = metrics or RunMetrics()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-writer")
+        self._consumer: Optional[asyncio.Task] = None
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    async def __aenter__(self) -> "ResultWriter":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def start(self):
+        """Start the consumer task on the running event loop."""
+        if self._consumer is None:
+            self._consumer = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, result: ParsedResult):
+        """Queue a result for writing, waiting while the queue is full."""
+        self.start()
+        await self._queue.put(result)
+
+    def defer(self, fn: Callable[..., None], *args):
+        """Run ``fn(*args)`` on the writer thread without waiting for it.
+
+        Deferred calls run in the order they were made; once the writer is
+        closed they run in the calling thread instead.
+        """
+        try:
+            self._executor.submit(self._run_deferred, fn, args)
+        except RuntimeError:  # executor already shut down
+            self._run_deferred(fn, args)
+
+    def _run_deferred(self, fn: Callable[..., None], args: tuple):
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error in deferred write: {str(e)}")
+
+    async def close(self):
+        """Write everything still queued, flush the store and stop the thread."""
+        if self._consumer is not None:
+            await self._queue.put(_CLOSE)
+            await self._consumer
+            self._consumer = None
+        self._executor.shutdown(wait=True)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if _CLOSE in batch:
+                closing = True
+                batch.remove(_CLOSE)
+            if batch:
+                await loop.run_in_executor(self._executor, self._write_batch, batch, loop)
+                self.batches += 1
+
+        try:
+            await loop.run_in_executor(self._executor, self.store.flush)
+        except Exception as e:
+            print(f"Error flushing cohort store: {str(e)}")
+
+    def _write_batch(self, batch: List[ParsedResult], loop: asyncio.AbstractEventLoop):
+        """Write one batch. Runs on the writer thread."""
+        for result in batch:
+            # Completion callbacks touch state owned by the event loop
+            on_stored = None
+            if result.on_stored is not None:
+                on_stored = lambda callback=result.on_stored: loop.call_soon_threadsafe(callback)
+            try:
+                with self.metrics.stage('write', result.source_id, wait=time.perf_counter() - result.queued_at):
+                    if self.raw_response_dir is not None:
+                        save_raw_response(result.resume_info, result.token_usage, self.raw_response_dir)
+                    if self.csv_output_dir is not None:
+                        save_resume_data(result.resume_info, result.extra_info, self.csv_output_dir)
+                    self.store.add(result.resume_info, result.extra_info, on_stored=on_stored, source_id=result.source_id)
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"Error writing results for {result.source_id}: {str(e)}")
+            if self.ledger is not None:
+                self.ledger.record(result.token_usage)
+
+        if self.ledger is not None:
+            try:
+                self.ledger.flush()
+            except OSError as e:
+                print(f"Error writing token ledger: {str(e)}")
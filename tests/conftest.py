@@ -7,6 +7,10 @@ from resume_parser.models import ResumeInfo, ExtraCurricular
 from resume_parser.parser import ResumeParser
 from resume_parser.extractor import ExtraCurricularExtractor
 
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line("markers", "benchmark: timing comparison on real resume data (deselect with -m 'not benchmark')")
+
 @pytest.fixture
 def test_data_dir():
     """Fixture to provide test data directory path."""
@@ -109,6 +113,43 @@ def sample_resume_info():
         }]
     )
 
+@pytest.fixture
+def make_resume_info():
+    """Fixture to provide a factory of complete parsed resumes.
+    
+    The factory takes the registration number and how many semesters (up to
+    two) and projects the resume lists, so tests can vary candidates and
+    their scores.
+    """
+    skills = {
+        "programming_languages": ["Python", "Java"],
+        "frameworks": ["Django"],
+        "databases": ["MySQL"],
+        "other_technologies": ["Git"],
+        "knowledge_area": ["Machine Learning"]
+    }
+    grades = [(9.0, 9.0), (8.35, 8.68)]
+    
+    def make(reg_no="06IT68", semesters=2, projects=0):
+        return ResumeInfo(
+            metadata={
+                "name": "Test Student", "gender": "M", "reg_no": reg_no, "dob": "01/01/2000",
+                "email": "test@example.com", "phone": "1234567890", "mobile": "1234567890",
+                "branch": "IT", "degree": "B.Tech"
+            },
+            academic_performance=[
+                {"semester": i + 1, "duration": "2021-22", "sgpa": sgpa, "cgpa": cgpa, "degree": "B.Tech"}
+                for i, (sgpa, cgpa) in enumerate(grades[:semesters])
+            ],
+            technical_skills=skills,
+            projects=[
+                {"name": f"Project {i}", "company": "Infosys", "duration": "2 months", "skill": skills}
+                for i in range(projects)
+            ]
+        )
+    
+    return make
+
 @pytest.fixture
 def sample_extra_info():
     """Fixture to provide sample ExtraCurricular for testing."""
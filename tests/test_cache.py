@@ -0,0 +1,132 @@
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock
+from openai.types import CompletionUsage
+
+from resume_parser.cache import ExtractionCache, ResultCache, SQLiteResultCache
+from resume_parser.models import ResumeInfo
+from resume_parser.parser import ResumeParser
+
+@pytest.fixture
+def resume_info():
+    """Fixture to provide a complete ResumeInfo."""
+    return ResumeInfo(
+        metadata={
+            "name": "Test Student", "gender": "Male", "reg_no": "TEST001",
+            "dob": "1990-01-01", "email": "test@example.com", "phone": "NA",
+            "mobile": "0987654321", "branch": "Computer Science", "degree": "B.Tech"
+        },
+        academic_performance=[],
+        projects=[],
+        technical_skills={"programming_languages": ["Python"]}
+    )
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to provide an empty extraction cache."""
+    return ExtractionCache(tmp_path / "llm_cache")
+
+def test_key_depends_on_text_model_and_prompt(cache):
+    """Test that the cache key covers every input of the extraction."""
+    key = cache.key("Reg. No. : TEST001", "deepseek-chat", "prompt")
+    
+    # Whitespace differences normalise to the same text
+    assert cache.key("Reg. No.    : TEST001 ", "deepseek-chat", "prompt") == key
+    assert cache.key("Reg. No. : TEST002", "deepseek-chat", "prompt") != key
+    assert cache.key("Reg. No. : TEST001", "other-model", "prompt") != key
+    assert cache.key("Reg. No. : TEST001", "deepseek-chat", "new prompt") != key
+
+def test_get_put_roundtrip(cache, resume_info):
+    """Test storing and loading a cached extraction."""
+    key = cache.key("text", "deepseek-chat", "prompt")
+    assert cache.get(key) is None
+    
+    cache.put(key, resume_info, "deepseek-chat")
+    assert cache.get(key) == resume_info
+    assert (cache.hits, cache.misses) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_parser_cache_hit_skips_llm(cache, resume_info, monkeypatch, tmp_path):
+    """Test that a cache hit makes no LLM call and reports zero usage."""
+    monkeypatch.chdir(tmp_path)
+    parser = ResumeParser("test_api_key", "https://test.api.deepseek.com", cache=cache)
+    
+    completion = Mock()
+    completion.usage = CompletionUsage(completion_tokens=50, prompt_tokens=100, total_tokens=150)
+    parser.client = Mock()
+    parser.client.chat.completions.create_with_completion = AsyncMock(
+        return_value=(resume_info, completion)
+    )
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(cache, name)
+        monkeypatch.setattr(cache, name, lambda *args, method=method: threads.append(threading.get_ident()) or method(*args))
+    
+    await parser.parse_text("Reg. No. : TEST001", "TEST001")
+    _, _, token_usage = await parser.parse_text("Reg. No. : TEST001", "TEST001")
+    
+    assert len(threads) == 3 and threading.get_ident() not in threads  # cache files are not touched on the loop
+    assert parser.client.chat.completions.create_with_completion.await_count == 1
+    assert token_usage.total_tokens == 0
+    assert token_usage.prompt_tokens == 0
+
+def test_result_cache_requires_storage():
+    """Test that the result cache base class cannot be used without a storage backend."""
+    with pytest.raises(TypeError):
+        ResultCache()
+
+def test_result_cache_key_covers_content_model_and_prompt(tmp_path):
+    """Test that result cache keys hash the file content with the extraction inputs."""
+    cache = SQLiteResultCache(tmp_path / "results.sqlite3")
+    key = cache.key(b"%PDF-1", "deepseek-chat", "prompt")
+    
+    assert cache.key(b"%PDF-1", "deepseek-chat", "prompt") == key
+    assert cache.key(b"%PDF-2", "deepseek-chat", "prompt") != key
+    assert cache.key(b"%PDF-1", "other-model", "prompt") != key
+    assert cache.key(b"%PDF-1", "deepseek-chat", "other prompt") != key
+
+def test_result_cache_survives_restart_and_counts_hits(tmp_path):
+    """Test that results are shared by every cache opened on the same database."""
+    path = tmp_path / "results.sqlite3"
+    first = SQLiteResultCache(path)
+    assert first.get("k") is None
+    first.put("k", {"resume": {"reg_no": "TEST001"}})
+    
+    second = SQLiteResultCache(path)
+    assert second.get("k") == {"resume": {"reg_no": "TEST001"}}
+    assert (first.hits, first.misses, second.hits) == (0, 1, 1)
+    
+    stats = second.stats()
+    assert stats["entries"] == 1
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+def test_result_cache_expires_old_entries(tmp_path, monkeypatch):
+    """Test that entries older than max_age are misses and get evicted."""
+    import time
+    cache = SQLiteResultCache(tmp_path / "results.sqlite3", max_age=60)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now - 120)
+    cache.put("old", {"n": 1})
+    monkeypatch.setattr(time, "time", lambda: now)
+    
+    assert cache.get("old") is None
+    assert cache.stats()["evictions"] == 1
+
+def test_result_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    """Test that the size limit evicts the entries accessed longest ago."""
+    import time
+    clock = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    value = {"data": "x" * 100}
+    cache = SQLiteResultCache(tmp_path / "results.sqlite3", max_bytes=350, max_age=None)
+    
+    for key in ("a", "b", "c"):
+        cache.put(key, value)
+        clock[0] += 1
+    cache.get("a")
+    clock[0] += 1
+    cache.put("d", value)
+    
+    assert cache.get("b") is None
+    assert all(cache.get(key) == value for key in ("a", "c", "d"))
+    assert cache.stats()["evictions"] == 1
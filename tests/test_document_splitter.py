@@ -4,6 +4,8 @@ from pypdf import PdfWriter, PdfReader
 from pathlib import Path
 
 from resume_parser.document_splitter import ResumeSplitter
+from resume_parser.models import HeaderProfile
+from resume_parser.text_extraction import PageTextExtractor, normalize_text
 
 @pytest.fixture
 def combined_pdf(test_data_dir, sample_pdfs):
@@ -87,4 +89,220 @@ def test_split_resumes_with_invalid_pdf(output_dir):
     
     splitter = ResumeSplitter(invalid_pdf, output_dir)
     with pytest.raises(Exception):
-        splitter.split_resumes() 
\ No newline at end of file
+        splitter.split_resumes() 
+
+def test_index_pages_extracts_each_page_once(combined_pdf, output_dir, sample_pdfs, monkeypatch):
+    """Test that splitting and verification share a single text extraction pass."""
+    from pypdf import PageObject
+
+    calls = []
+    original = PageObject.extract_text
+
+    def counting_extract_text(self, *args, **kwargs):
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(PageObject, "extract_text", counting_extract_text)
+
+    os.makedirs(output_dir, exist_ok=True)
+    splitter = ResumeSplitter(combined_pdf, output_dir)
+    splitter.index_pages()
+    splitter.split_resumes()
+    splitter.verify_split()
+
+    assert len(calls) == len(splitter.page_texts)
+    assert len(splitter.boundaries) == len(sample_pdfs)
+
+def test_split_finds_boundaries_without_text_extraction(combined_pdf, tmp_path, sample_pdfs, monkeypatch):
+    """Test that splitting reads headers from the content streams instead of extracting text."""
+    from pypdf import PageObject
+
+    indexed = ResumeSplitter(combined_pdf, tmp_path)
+    expected = indexed.index_pages()
+
+    calls = []
+    original = PageObject.extract_text
+
+    def counting_extract_text(self, *args, **kwargs):
+        calls.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(PageObject, "extract_text", counting_extract_text)
+
+    splitter = ResumeSplitter(combined_pdf, tmp_path)
+    assert splitter.split_resumes() == len(sample_pdfs)
+    assert splitter.boundaries == expected
+    assert splitter.verify_split()
+    assert calls == []
+    assert splitter.text_fallbacks == 0
+
+def test_find_boundaries_falls_back_to_text_extraction(combined_pdf, sample_pdfs, monkeypatch):
+    """Test that pages whose content stream is unreadable are extracted in full."""
+    expected = ResumeSplitter(combined_pdf).index_pages()
+    monkeypatch.setattr("resume_parser.document_splitter.page_strings", lambda page: None)
+
+    splitter = ResumeSplitter(combined_pdf)
+    assert splitter.find_boundaries() == expected
+    assert splitter.text_fallbacks == expected[-1].end
+    assert splitter.verify_split(check_files=False)
+
+def test_find_boundaries_reads_kerned_headers(sample_pdfs, tmp_path):
+    """Test that a header drawn as a kerned TJ array is still found in the content stream."""
+    writer = PdfWriter()
+    for pdf_path in sample_pdfs:
+        for page in PdfReader(pdf_path).pages:
+            written = writer.add_page(page)
+            contents = written.get_contents()
+            contents.set_data(contents.get_data().replace(
+                b'(    NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA, SURATHKAL   ) Tj',
+                b'[(    NA)-20(TIONAL INSTITUTE)-300(OF TECH)15(NOLOGY KARNATAKA, SURATHKAL   )] TJ'
+            ))
+            written.replace_contents(contents)
+    compiled = tmp_path / "kerned.pdf"
+    with open(compiled, 'wb') as f:
+        writer.write(f)
+    
+    expected = ResumeSplitter(compiled).index_pages()
+    assert len(expected) == len(sample_pdfs)
+    
+    splitter = ResumeSplitter(compiled)
+    assert splitter.find_boundaries() == expected
+    assert splitter.text_fallbacks == 0
+    assert splitter.verify_split(check_files=False)
+
+def test_find_boundaries_falls_back_on_fragmented_headers(sample_pdfs, tmp_path):
+    """Test that a header drawn in fragments split mid-word is extracted in full, not skipped."""
+    writer = PdfWriter()
+    for pdf_path in sample_pdfs[:2]:
+        for page in PdfReader(pdf_path).pages:
+            written = writer.add_page(page)
+            contents = written.get_contents()
+            contents.set_data(contents.get_data().replace(
+                b'(    NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA, SURATHKAL   ) Tj',
+                b'(    NATIONA) Tj (L INSTI) Tj (TUTE OF TECHNOLOGY KARNATAKA, SURATHKAL   ) Tj'
+            ))
+            written.replace_contents(contents)
+    compiled = tmp_path / "fragmented.pdf"
+    with open(compiled, 'wb') as f:
+        writer.write(f)
+    
+    expected = ResumeSplitter(compiled).index_pages()
+    assert len(expected) == 2
+    
+    splitter = ResumeSplitter(compiled)
+    assert splitter.find_boundaries() == expected
+    assert splitter.text_fallbacks == 2
+    assert splitter.verify_split(check_files=False)
+
+def test_verify_split_fails_without_boundaries(combined_pdf):
+    """Test that a non-empty PDF in which no header is found does not verify."""
+    other = HeaderProfile(name='IISc', header=['INDIAN INSTITUTE OF SCIENCE, BANGALORE'])
+    splitter = ResumeSplitter(combined_pdf, profiles=[other])
+    
+    assert splitter.find_boundaries() == []
+    assert not splitter.verify_split(check_files=False)
+
+def test_resume_texts(combined_pdf, output_dir, sample_pdfs):
+    """Test that resume texts are served from the page index."""
+    splitter = ResumeSplitter(combined_pdf, output_dir)
+    texts = dict(splitter.resume_texts())
+
+    assert set(texts) == {pdf.name for pdf in sample_pdfs}
+    for text in texts.values():
+        assert splitter.pattern in text
+
+def test_compact_split_writes_only_used_resources(combined_pdf, tmp_path, sample_pdfs):
+    """Test that compact mode prunes shared resources and reports bytes written."""
+    compact_dir = tmp_path / "compact"
+    full_dir = tmp_path / "full"
+    os.makedirs(compact_dir)
+    os.makedirs(full_dir)
+    
+    compact = ResumeSplitter(combined_pdf, compact_dir)
+    compact.split_resumes()
+    full = ResumeSplitter(combined_pdf, full_dir, compact=False)
+    full.split_resumes()
+    
+    compact_files = sorted(compact_dir.glob("*.pdf"))
+    assert compact.bytes_written == sum(f.stat().st_size for f in compact_files)
+    assert compact.bytes_written <= full.bytes_written
+    
+    # Pages render the same text after pruning
+    for pdf in compact_files:
+        compact_text = [p.extract_text() for p in PdfReader(pdf).pages]
+        full_text = [p.extract_text() for p in PdfReader(full_dir / pdf.name).pages]
+        assert compact_text == full_text
+
+def test_iter_resumes_streams_same_texts(combined_pdf, tmp_path, sample_pdfs):
+    """Test that streaming yields the indexed texts and still verifies the split."""
+    indexed = ResumeSplitter(combined_pdf, tmp_path)
+    streamed = ResumeSplitter(combined_pdf, tmp_path)
+    
+    assert list(streamed.iter_resumes(save_pdfs=True)) == list(indexed.resume_texts())
+    assert streamed.page_texts == []
+    assert len(list(tmp_path.glob("*.pdf"))) == len(sample_pdfs)
+    assert streamed.verify_split()
+
+def test_iter_resumes_reopens_writing_reader_per_shard(combined_pdf, tmp_path, sample_pdfs, monkeypatch):
+    """Test that saving while streaming does not keep one reader for the whole PDF."""
+    import resume_parser.document_splitter as document_splitter
+    opened = []
+    open_pdf = document_splitter.open_pdf
+    monkeypatch.setattr(document_splitter, "open_pdf", lambda source: opened.append(source) or open_pdf(source))
+    
+    splitter = ResumeSplitter(combined_pdf, tmp_path, text_extractor=PageTextExtractor(max_workers=1, pages_per_shard=1))
+    resumes = list(splitter.iter_resumes(save_pdfs=True))
+    
+    assert len(opened) > 1
+    for filename, text in resumes:
+        written = [normalize_text(page.extract_text()) for page in PdfReader(tmp_path / filename).pages]
+        assert "\n".join(written) == text
+
+def test_iter_resumes_from_bytes(combined_pdf, sample_pdfs):
+    """Test that an in-memory compiled PDF is split without an output directory."""
+    splitter = ResumeSplitter(combined_pdf.read_bytes())
+    
+    names = [filename for filename, _ in splitter.iter_resumes()]
+    assert names == [boundary.filename for boundary in ResumeSplitter(combined_pdf).find_boundaries()]
+    assert len(names) == len(sample_pdfs)
+    assert splitter.verify_split(check_files=False)
+
+def test_mixed_institution_compilation(sample_pdfs, tmp_path):
+    """Test that resumes of several institutions are split in one pass."""
+    iisc = HeaderProfile(
+        name='IISc',
+        header=['INDIAN INSTITUTE OF SCIENCE, BANGALORE', 'C V RAMAN ROAD, BANGALORE-560012'],
+        reg_no_label='Roll No.'
+    )
+    writer = PdfWriter()
+    for i, pdf_path in enumerate(sample_pdfs):
+        for page in PdfReader(pdf_path).pages:
+            written = writer.add_page(page)
+            if i == 1:
+                # Re-brand the second resume as another institution's
+                contents = written.get_contents()
+                contents.set_data(contents.get_data()
+                                  .replace(b'NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA, SURATHKAL', iisc.header[0].encode())
+                                  .replace(b'P.O SRINIVASNAGAR, MANGALORE-575025', iisc.header[1].encode())
+                                  .replace(b'Reg. No.', b'Roll No.'))
+                written.replace_contents(contents)
+    compiled = tmp_path / "mixed.pdf"
+    with open(compiled, 'wb') as f:
+        writer.write(f)
+
+    filenames = [ResumeSplitter(pdf).find_boundaries()[0].filename for pdf in sample_pdfs]
+    expected = list(zip(filenames, ['NITK', 'IISc', 'NITK']))
+    nitk_only = ResumeSplitter(compiled)
+    assert len(nitk_only.find_boundaries()) == 2
+
+    output = tmp_path / "split"
+    os.makedirs(output)
+    splitter = ResumeSplitter(compiled, output, profiles=[nitk_only.profiles[0], iisc])
+    assert splitter.split_resumes() == 3
+    assert [(b.filename, b.institution) for b in splitter.boundaries] == expected
+    assert splitter.text_fallbacks == 0
+    assert splitter.verify_split()
+
+    streamed = ResumeSplitter(compiled, profiles=splitter.profiles)
+    list(streamed.iter_resumes())
+    assert streamed.boundaries == splitter.boundaries
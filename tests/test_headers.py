@@ -0,0 +1,67 @@
+import re
+
+import pytest
+
+from resume_parser.headers import NITK, HeaderMatcher, load_header_profiles, trie_pattern
+from resume_parser.models import HeaderProfile
+
+IISC = HeaderProfile(
+    name='IISc',
+    header=['INDIAN INSTITUTE OF SCIENCE, BANGALORE', 'C V RAMAN ROAD, BANGALORE-560012'],
+    reg_no_label='Roll No.',
+    reg_no_pattern=r'\d{2}-\d{2}-\d{2}-\d{3}-\d{5}'
+)
+
+
+def test_trie_pattern_matches_exactly_the_words():
+    """Test that the trie regex factors shared prefixes and prefers the longest word."""
+    pattern = trie_pattern(['ABC', 'ABD', 'AB', 'X.Y'])
+    assert pattern.startswith('(?:AB')
+    compiled = re.compile(pattern)
+
+    assert [m.group() for m in compiled.finditer('ABD AB ABCD XZY X.Y A')] == ['ABD', 'AB', 'ABC', 'X.Y']
+    with pytest.raises(ValueError):
+        trie_pattern(['A', ''])
+
+
+def test_matcher_finds_headers_of_every_profile():
+    """Test that one search finds the headers of several institutions in page order."""
+    matcher = HeaderMatcher([NITK, IISC])
+    text = f"{IISC.header_text} Placements\nRoll No. : 04-01-00-101-12345\n{NITK.header_text}"
+
+    assert matcher.find(text) == [IISC, NITK]
+    assert matcher.find("NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA") == []
+    assert matcher.partial(NITK.header[0])
+    assert matcher.partial("NATIONA L INSTI TUTE OF TECHNOLOGY KARNATAKA, SURATHKAL")
+    assert not matcher.partial("INDIAN INSTITUTE OF TECHNOLOGY")
+
+
+def test_matcher_reads_reg_no_per_profile():
+    """Test the registration number extractors on extracted text and raw strings."""
+    matcher = HeaderMatcher([NITK, IISC])
+
+    assert matcher.reg_no("Gender : MALE\nReg. No. :06CO01\nDate", NITK) == "06CO01"
+    assert matcher.reg_no("Roll No. : 04-01-00-101-12345\n", IISC) == "04-01-00-101-12345"
+    assert matcher.reg_no("Reg. No. : 06CO01\n", IISC) is None
+    assert matcher.reg_no_from_strings(["Reg. No. :", "", "06CO01"], NITK) == "06CO01"
+    assert matcher.reg_no_from_strings(["Reg. No. : 06CO01"], NITK) == "06CO01"
+    assert matcher.reg_no_from_strings(["Reg. No. :", "Date Of Birth :"], NITK) is None
+
+
+def test_matcher_rejects_duplicate_profiles():
+    """Test that profiles must differ in name and header."""
+    with pytest.raises(ValueError):
+        HeaderMatcher([])
+    with pytest.raises(ValueError):
+        HeaderMatcher([NITK, NITK.model_copy(update={'name': 'other'})])
+    with pytest.raises(ValueError):
+        HeaderMatcher([NITK, IISC.model_copy(update={'name': 'NITK'})])
+
+
+def test_load_header_profiles(tmp_path):
+    """Test loading a list of profiles from JSON, with default reg no settings."""
+    path = tmp_path / "profiles.json"
+    path.write_text('[{"name": "NITK", "header": ["NATIONAL INSTITUTE OF TECHNOLOGY KARNATAKA, SURATHKAL",'
+                    ' "P.O SRINIVASNAGAR, MANGALORE-575025"]}]')
+
+    assert load_header_profiles(path) == [NITK]
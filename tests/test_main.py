@@ -1,5 +1,6 @@
+import json
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 
 from resume_parser.main import process_resumes
 
@@ -9,6 +10,12 @@ def mock_splitter(monkeypatch):
     mock = Mock()
     mock.return_value.split_resumes.return_value = 3
     mock.return_value.verify_split.return_value = True
+    mock.return_value.bytes_written = 0
+    mock.return_value.index_pages.return_value = [Mock(), Mock()]
+    mock.return_value.iter_resumes.side_effect = lambda save_pdfs=False: iter([
+        ("test1.pdf", "resume one"),
+        ("test2.pdf", "resume two")
+    ])
     monkeypatch.setattr("resume_parser.main.ResumeSplitter", mock)
     return mock
 
@@ -16,7 +23,9 @@ def mock_splitter(monkeypatch):
 def mock_parser(monkeypatch):
     """Mock ResumeParser class."""
     mock = Mock()
-    mock.return_value.parse_resume.return_value = Mock()
+    mock.return_value.parse_text.return_value = Mock()
+    mock.return_value.aclose = AsyncMock()
+    mock.return_value.prompt_cache.hit_ratio = 0.0
     monkeypatch.setattr("resume_parser.main.ResumeParser", mock)
     return mock
 
@@ -25,23 +34,73 @@ def test_process_resumes(mock_splitter, mock_parser, tmp_path):
     input_pdf = tmp_path / "test.pdf"
     output_dir = tmp_path / "output"
     
-    # Create test files
     input_pdf.touch()
     output_dir.mkdir()
-    (output_dir / "test1.pdf").touch()
-    (output_dir / "test2.pdf").touch()
     
     # Run process_resumes
     process_resumes(str(input_pdf), str(output_dir))
     
     # Verify calls
-    mock_splitter.return_value.split_resumes.assert_called_once()
+    mock_splitter.return_value.iter_resumes.assert_called_once_with(save_pdfs=True)
     mock_splitter.return_value.verify_split.assert_called_once()
-    assert mock_parser.return_value.parse_resume.call_count == 2
+    assert mock_parser.return_value.parse_text.call_count == 2
+    mock_parser.return_value.aclose.assert_awaited_once()
+    mock_parser.return_value.parse_resume.assert_not_called()
+
+def test_process_resumes_without_pdf_output(mock_splitter, mock_parser, tmp_path):
+    """Test that split PDFs are optional and text comes from the page stream."""
+    process_resumes(str(tmp_path / "test.pdf"), str(tmp_path / "output"), save_pdfs=False)
+    
+    mock_splitter.return_value.iter_resumes.assert_called_once_with(save_pdfs=False)
+    mock_splitter.return_value.verify_split.assert_called_once_with(check_files=False)
+    assert not (tmp_path / "output" / "pdfs").exists()
+    mock_parser.return_value.parse_text.assert_any_call("resume one", "test1")
 
 def test_process_resumes_split_verification_failed(mock_splitter, mock_parser, tmp_path):
     """Test handling of split verification failure."""
     mock_splitter.return_value.verify_split.return_value = False
     
     with pytest.raises(ValueError, match="Resume splitting verification failed"):
-        process_resumes(str(tmp_path / "test.pdf"), str(tmp_path / "output")) 
\ No newline at end of file
+        process_resumes(str(tmp_path / "test.pdf"), str(tmp_path / "output")) 
+def test_process_resumes_incremental_skips_done(mock_splitter, mock_parser, tmp_path):
+    """Test that resumes recorded as done in the manifest are not parsed again."""
+    from resume_parser.manifest import BatchManifest, content_hash, DONE
+    
+    output_dir = tmp_path / "output"
+    manifest = BatchManifest(output_dir / "manifest.jsonl")
+    manifest.mark("test1", content_hash("resume one"), DONE)
+    
+    process_resumes(str(tmp_path / "test.pdf"), str(output_dir))
+    assert mock_parser.return_value.parse_text.call_count == 1
+    mock_parser.return_value.parse_text.assert_called_with("resume two", "test2")
+    
+    mock_parser.return_value.parse_text.reset_mock()
+    process_resumes(str(tmp_path / "test.pdf"), str(output_dir), incremental=False)
+    assert mock_parser.return_value.parse_text.call_count == 2
+
+def test_process_resumes_writes_cohort_store(mock_splitter, mock_parser, tmp_path, monkeypatch, make_resume_info):
+    """Test that parsed resumes go to the cohort tables and CSVs are optional."""
+    import pandas as pd
+    from resume_parser.models import ExtraCurricular
+    from resume_parser.utils import TokenUsage
+    
+    monkeypatch.chdir(tmp_path)
+    
+    resume_info = make_resume_info("06IT68")
+    token_usage = TokenUsage("06IT68", 50, 100, 150, 0, 0, 0)
+    mock_parser.return_value.parse_text = AsyncMock(return_value=(resume_info, ExtraCurricular(), token_usage))
+    output_dir = tmp_path / "output"
+    
+    process_resumes(str(tmp_path / "test.pdf"), str(output_dir), save_pdfs=False)
+    assert list(pd.read_parquet(output_dir / "cohort" / "metadata")["reg_no"]) == ["06IT68", "06IT68"]
+    assert not (output_dir / "parsed_data").exists()
+    assert (tmp_path / "data" / "raw_responses" / "06IT68" / "llm_response.json").exists()
+    assert len((output_dir / "token_usage.jsonl").read_text().splitlines()) == 2
+    report = json.loads((output_dir / "run_report.json").read_text())
+    assert report["results"] == {"done": 2}
+    assert report["stages"]["write"]["count"] == 2
+    assert report["tokens"]["total_tokens"] == 300
+    
+    process_resumes(str(tmp_path / "test.pdf"), str(output_dir), save_pdfs=False,
+                    incremental=False, export_csv=True)
+    assert (output_dir / "parsed_data" / "06IT68" / "06IT68_metadata.csv").exists()
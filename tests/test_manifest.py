@@ -0,0 +1,41 @@
+from resume_parser.manifest import BatchManifest, content_hash, RUNNING, DONE, FAILED
+
+def test_content_hash_ignores_whitespace_runs():
+    """Test that the hash is taken over normalised text."""
+    assert content_hash("Reg. No.    : 06CO01") == content_hash("Reg. No. : 06CO01")
+    assert content_hash("Reg. No. : 06CO01") != content_hash("Reg. No. : 06CO02")
+
+def test_manifest_survives_restart(tmp_path):
+    """Test that status changes are replayed from the log."""
+    path = tmp_path / "manifest.jsonl"
+    manifest = BatchManifest(path)
+    manifest.mark("06CO01", "hash1", RUNNING)
+    manifest.mark("06CO01", "hash1", DONE)
+    manifest.mark("06CO02", "hash2", RUNNING)
+    manifest.mark("06CO02", "hash2", FAILED, error="timeout")
+    
+    reloaded = BatchManifest(path)
+    assert reloaded.is_done("06CO01", "hash1")
+    assert not reloaded.is_done("06CO02", "hash2")
+    assert reloaded.entries["06CO02"]["error"] == "timeout"
+    assert reloaded.entries["06CO01"]["attempts"] == 1
+    assert reloaded.entries["06CO01"]["finished_at"] is not None
+    assert reloaded.counts() == {DONE: 1, FAILED: 1}
+
+def test_changed_text_is_not_done(tmp_path):
+    """Test that a resume with different content is processed again."""
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+    manifest.mark("06CO01", "hash1", RUNNING)
+    manifest.mark("06CO01", "hash1", DONE)
+    
+    assert not manifest.is_done("06CO01", "hash2")
+
+def test_truncated_line_is_ignored(tmp_path):
+    """Test that a partially written line from a crash does not break loading."""
+    path = tmp_path / "manifest.jsonl"
+    manifest = BatchManifest(path)
+    manifest.mark("06CO01", "hash1", DONE)
+    with open(path, "a") as f:
+        f.write('{"source_id": "06CO02", "sta')
+    
+    assert BatchManifest(path).is_done("06CO01", "hash1")
@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+import pytest
+from resume_parser.metrics import RunMetrics, timed
+
+def test_report_percentiles_and_stage_order():
+    """Test that samples are summarised per stage in pipeline order."""
+    metrics = RunMetrics()
+    for i in range(100):
+        metrics.record("write", f"R{i}", wall=0.01 * (i + 1), cpu=0.001, wait=0.5)
+        metrics.record("llm", f"R{i}", wall=1.0, wait=0.1 * i)
+        metrics.completed("done")
+    
+    report = metrics.report(slowest=2)
+    
+    assert list(report["stages"]) == ["llm", "write"]
+    write = report["stages"]["write"]
+    assert write["count"] == 100
+    assert write["wall"]["p50"] == pytest.approx(0.505)
+    assert write["wall"]["p99"] == pytest.approx(0.9901)
+    assert write["wait"]["max"] == pytest.approx(0.5)
+    assert [s["source_id"] for s in write["slowest"]] == ["R99", "R98"]
+    assert report["stages"]["llm"]["cpu"] is None
+    assert report["results"] == {"done": 100}
+    assert report["resumes_per_minute"] > 0
+    assert report["seconds_to_first_result"] is not None
+
+def test_stage_measures_thread_cpu():
+    """Test that CPU time counts work but not sleeping."""
+    metrics = RunMetrics()
+    with metrics.stage("regex", "busy"):
+        end = time.perf_counter() + 0.05
+        while time.perf_counter() < end:
+            pass
+    with metrics.stage("regex", "idle"):
+        time.sleep(0.05)
+    
+    stage = metrics._stages["regex"]
+    assert stage.cpu[0] > 0.02
+    assert stage.cpu[1] < 0.02
+    assert min(stage.wall) >= 0.05
+
+def test_record_from_many_threads():
+    """Test that concurrent recording loses no samples."""
+    metrics = RunMetrics()
+    
+    def work(n):
+        for i in range(500):
+            metrics.record("write", f"{n}-{i}", 0.001)
+    
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert metrics.report()["stages"]["write"]["count"] == 2000
+
+def test_timed_reports_time_per_item():
+    """Test that timed() measures the time to produce each item."""
+    def slow():
+        time.sleep(0.02)
+        yield "a"
+        yield "b"
+    
+    items = list(timed(slow()))
+    assert [item for item, _, _ in items] == ["a", "b"]
+    assert items[0][1] >= 0.02 > items[1][1]
+
+def test_write_report_is_valid_json(tmp_path):
+    """Test that the report file is strict JSON with extra sections."""
+    metrics = RunMetrics()
+    metrics.record("llm", "R0", 1.0)
+    
+    metrics.write_report(tmp_path / "run" / "report.json", tokens={"total_tokens": 150})
+    
+    report = json.loads((tmp_path / "run" / "report.json").read_text(), parse_constant=pytest.fail)
+    assert report["tokens"] == {"total_tokens": 150}
+    assert report["stages"]["llm"]["count"] == 1
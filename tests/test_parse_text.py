@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from io import BytesIO
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+from openai.types import CompletionUsage
+
+from resume_parser.metrics import RunMetrics
+from resume_parser.models import ExtraCurricular
+from resume_parser.parser import ResumeParser, _capture_usage
+from resume_parser.scheduler import LLMScheduler
+
+def mock_client(resume_info, delay=0.0):
+    """LLM client returning ``resume_info`` after ``delay`` seconds."""
+    async def create_with_completion(**kwargs):
+        await asyncio.sleep(delay)
+        completion = Mock()
+        completion.usage = CompletionUsage(completion_tokens=50, prompt_tokens=100, total_tokens=150)
+        return resume_info, completion
+    
+    client = Mock()
+    client.chat.completions.create_with_completion = AsyncMock(side_effect=create_with_completion)
+    return client
+
+@pytest.fixture
+def parser(monkeypatch, tmp_path, make_resume_info):
+    """Parser with a mocked LLM client, writing into a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    parser = ResumeParser("test_api_key", "https://test.api.deepseek.com", use_cache=False)
+    parser.client = mock_client(make_resume_info("TEST001"))
+    return parser
+
+@pytest.mark.asyncio
+async def test_parse_text_skips_pdf_decoding(parser, monkeypatch):
+    """Test that parse_text works on already extracted text without touching PdfReader."""
+    monkeypatch.setattr("resume_parser.text_extraction.PdfReader", Mock(side_effect=AssertionError))
+    
+    resume_info, extra_info, token_usage = await parser.parse_text("Reg. No. : TEST001", "TEST001")
+    
+    assert resume_info.metadata.reg_no == "TEST001"
+    assert isinstance(extra_info, ExtraCurricular)
+    assert token_usage.reg_no == "TEST001"
+
+@pytest.mark.asyncio
+async def test_parse_text_runs_regex_off_event_loop(parser):
+    """Test that pattern extraction runs in an executor thread, not on the event loop."""
+    loop_thread = threading.get_ident()
+    extract_threads = []
+    original_extract = parser.extractor.extract
+    
+    def recording_extract(text):
+        extract_threads.append(threading.get_ident())
+        return original_extract(text)
+    
+    parser.extractor.extract = recording_extract
+    
+    _, extra_info, _ = await parser.parse_text("Reg. No. : TEST001", "TEST001")
+    
+    assert isinstance(extra_info, ExtraCurricular)
+    assert extract_threads and extract_threads[0] != loop_thread
+
+@pytest.mark.asyncio
+async def test_parse_text_records_stage_timings(monkeypatch, tmp_path, make_resume_info):
+    """Test that LLM latency is recorded apart from the wait for a scheduler slot."""
+    monkeypatch.chdir(tmp_path)
+    metrics = RunMetrics()
+    parser = ResumeParser("test_api_key", "https://test.api.deepseek.com", use_cache=False,
+                          scheduler=LLMScheduler(max_in_flight=1), metrics=metrics)
+    parser.client = mock_client(make_resume_info("A"), delay=0.05)
+    
+    await asyncio.gather(parser.parse_text("Reg. No. : A", "A"), parser.parse_text("Reg. No. : B", "B"))
+    
+    llm = metrics.report()["stages"]["llm"]
+    assert llm["count"] == 2
+    assert llm["wall"]["p50"] == pytest.approx(0.05, abs=0.03)
+    assert llm["wait"]["max"] >= 0.04
+    assert metrics.report()["stages"]["regex"]["count"] == 2
+
+@pytest.mark.asyncio
+async def test_parse_resume_from_bytes(parser, sample_pdfs, tmp_path):
+    """Test that an uploaded PDF is parsed from memory without writing files."""
+    parser.save_raw_responses = False
+    parser.parse_text = AsyncMock(return_value=("resume", "extra", "usage"))
+    content = sample_pdfs[0].read_bytes()
+    
+    await parser.parse_resume(content, "upload-1")
+    await parser.parse_resume(BytesIO(content))
+    
+    first, second = parser.parse_text.await_args_list
+    assert first.args[1] == "upload-1" and second.args[1] == "upload"
+    assert first.args[0] == second.args[0] == "\n".join(parser.text_extractor.extract(sample_pdfs[0]))
+    assert list(tmp_path.iterdir()) == []
+
+def test_shared_http_client_records_usage_once():
+    """Test that parsers sharing a connection pool register the usage hook once."""
+    client = httpx.AsyncClient()
+    ResumeParser("test_api_key", "https://test.api.deepseek.com", http_client=client, use_cache=False)
+    ResumeParser("test_api_key", "https://test.api.deepseek.com", http_client=client, use_cache=False)
+    
+    assert client.event_hooks["response"].count(_capture_usage) == 1
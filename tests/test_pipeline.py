@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, Mock
+from resume_parser.manifest import BatchManifest, content_hash, DONE, FAILED
+from resume_parser.metrics import RunMetrics
+from resume_parser.models import ExtraCurricular
+from resume_parser.pipeline import SKIPPED, iter_in_thread, run_pipeline
+from resume_parser.store import CohortStore
+from resume_parser.utils import TokenUsage, calculate_candidate_score
+from resume_parser.writer import ResultWriter
+
+@pytest.fixture
+def parser(make_resume_info):
+    """Parser whose LLM call echoes the resume text as its reg_no."""
+    async def parse_text(text, source_id):
+        if text == "broken":
+            raise ValueError("bad response")
+        await asyncio.sleep(0.01)
+        return make_resume_info(text), ExtraCurricular(), TokenUsage(source_id, 50, 100, 150, 0, 0, 0)
+    
+    mock = Mock()
+    mock.parse_text = AsyncMock(side_effect=parse_text)
+    return mock
+
+@pytest.mark.asyncio
+async def test_pipeline_streams_scored_results(parser, tmp_path, make_resume_info):
+    """Test that each resume is scored, written and checkpointed."""
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+    metrics = RunMetrics()
+    resumes = [(f"R{i}.pdf", f"R{i}") for i in range(10)] + [("bad.pdf", "broken")]
+    
+    async with ResultWriter(CohortStore(tmp_path / "cohort"), raw_response_dir=None, metrics=metrics) as writer:
+        results = [r async for r in run_pipeline(iter_in_thread(iter(resumes)), parser, writer,
+                                                 manifest, concurrency=3, metrics=metrics)]
+    
+    by_id = {r.source_id: r for r in results}
+    assert len(results) == 11
+    assert by_id["bad"].status == FAILED and by_id["bad"].error == "bad response"
+    assert by_id["R3"].status == DONE
+    assert by_id["R3"].scores == calculate_candidate_score(make_resume_info("R3"), ExtraCurricular())
+    assert by_id["R3"].resume_info.metadata.reg_no == "R3"
+    assert manifest.is_done("R3", content_hash("R3"))
+    assert len(writer.store.read("metadata")) == 10
+    
+    report = metrics.report()
+    assert report["results"] == {DONE: 10, FAILED: 1}
+    assert {name: stage["count"] for name, stage in report["stages"].items()} == {
+        "queue": 11, "score": 10, "write": 10
+    }
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_done_resumes(parser, tmp_path):
+    """Test that resumes already done are reported as skipped, not parsed."""
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+    manifest.mark("R0", content_hash("R0"), DONE)
+    
+    async with ResultWriter(CohortStore(tmp_path / "cohort"), raw_response_dir=None) as writer:
+        results = [r async for r in run_pipeline(iter_in_thread(iter([("R0.pdf", "R0"), ("R1.pdf", "R1")])),
+                                                 parser, writer, manifest)]
+    
+    assert {r.source_id: r.status for r in results} == {"R0": SKIPPED, "R1": DONE}
+    parser.parse_text.assert_awaited_once_with("R1", "R1")
+
+@pytest.mark.asyncio
+async def test_pipeline_checkpoints_on_writer_thread(parser, tmp_path, monkeypatch):
+    """Test that manifest lines are appended by the writer thread, never on the event loop."""
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+    threads = []
+    append = manifest.append
+    monkeypatch.setattr(manifest, "append", lambda entry: threads.append(threading.current_thread().name) or append(entry))
+    resumes = [("R0.pdf", "R0"), ("bad.pdf", "broken")]
+    
+    async with ResultWriter(CohortStore(tmp_path / "cohort"), raw_response_dir=None) as writer:
+        [r async for r in run_pipeline(iter_in_thread(iter(resumes)), parser, writer, manifest)]
+    
+    assert len(threads) == 4
+    assert all(name.startswith("result-writer") for name in threads)
+    assert BatchManifest(tmp_path / "manifest.jsonl").counts() == {DONE: 1, FAILED: 1}
+
+@pytest.mark.asyncio
+async def test_pipeline_bounds_resumes_in_flight(parser, tmp_path):
+    """Test that the source is not read far ahead of the workers."""
+    produced = 0
+    
+    def source():
+        nonlocal produced
+        for i in range(100):
+            produced += 1
+            yield f"R{i}.pdf", f"R{i}"
+    
+    async with ResultWriter(CohortStore(tmp_path / "cohort"), raw_response_dir=None) as writer:
+        stream = run_pipeline(iter_in_thread(source()), parser, writer, concurrency=2)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)
+        assert first.status == DONE
+        # workers, inbox and outbox are bounded by the concurrency
+        assert produced <= 10
+        await stream.aclose()
+
+@pytest.mark.asyncio
+async def test_pipeline_raises_source_errors(parser, tmp_path):
+    """Test that a failing PDF source ends the stream with its error."""
+    def source():
+        yield "R0.pdf", "R0"
+        raise OSError("truncated PDF")
+    
+    async with ResultWriter(CohortStore(tmp_path / "cohort"), raw_response_dir=None) as writer:
+        with pytest.raises(OSError, match="truncated PDF"):
+            async for _ in run_pipeline(iter_in_thread(source()), parser, writer):
+                pass
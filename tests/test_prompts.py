@@ -0,0 +1,33 @@
+import pytest
+
+from resume_parser.prompts import (
+    SYSTEM_PROMPT,
+    USER_PREFIX,
+    PromptCacheStats,
+    build_messages,
+    cached_prompt_tokens
+)
+
+def test_static_prefix_is_shared():
+    """Test that every request starts with the same system block and user lead-in."""
+    first = build_messages("Reg. No. : 06CO01")
+    second = build_messages("Reg. No. : 06IT42 with a different resume")
+    
+    assert first[0] == second[0] == {"role": "system", "content": SYSTEM_PROMPT}
+    assert first[1]["content"].startswith(USER_PREFIX)
+    assert second[1]["content"].startswith(USER_PREFIX)
+
+def test_cached_prompt_tokens_formats():
+    """Test reading cache hits from OpenAI-style and DeepSeek-style usage."""
+    assert cached_prompt_tokens({"prompt_tokens_details": {"cached_tokens": 640}}) == 640
+    assert cached_prompt_tokens({"prompt_cache_hit_tokens": 512}) == 512
+    assert cached_prompt_tokens({"prompt_tokens": 100}) == 0
+
+def test_hit_ratio():
+    """Test the batch cache hit ratio."""
+    stats = PromptCacheStats()
+    assert stats.hit_ratio == 0.0
+    
+    stats.record(1000, 600)
+    stats.record(1000, 200)
+    assert stats.hit_ratio == pytest.approx(0.4)
@@ -0,0 +1,84 @@
+import json
+import pytest
+from resume_parser.models import ScoringProfile
+from resume_parser.rescore import load_cohort, rescore, main
+from resume_parser.utils import calculate_candidate_score, save_resume_data
+
+@pytest.fixture
+def sample_resume_info(make_resume_info):
+    """Fixture to provide a complete ResumeInfo for re-scoring."""
+    return make_resume_info("06IT68", projects=2)
+
+@pytest.fixture
+def parsed_cohort(tmp_path, sample_resume_info, sample_extra_info):
+    """Fixture to provide saved outputs for two candidates, one without a raw response."""
+    second = sample_resume_info.model_copy(deep=True)
+    second.metadata.reg_no = "06IT69"
+    second.projects = second.projects[:1]
+    
+    raw_dir = tmp_path / "raw_responses"
+    for resume_info in (sample_resume_info, second):
+        save_resume_data(resume_info, sample_extra_info, tmp_path)
+    (raw_dir / "06IT68").mkdir(parents=True)
+    with open(raw_dir / "06IT68" / "llm_response.json", "w") as f:
+        json.dump({"response": sample_resume_info.model_dump()}, f)
+    
+    return tmp_path / "parsed_data", raw_dir, [sample_resume_info, second], sample_extra_info
+
+def test_rescore_matches_candidate_scores(parsed_cohort):
+    """Test that re-scoring saved outputs reproduces the per-candidate scores."""
+    parsed_dir, raw_dir, resumes, extra_info = parsed_cohort
+    
+    scores = rescore(parsed_dir=str(parsed_dir), raw_dir=str(raw_dir))
+    
+    assert len(scores) == 2
+    for resume_info in resumes:
+        expected = calculate_candidate_score(resume_info, extra_info)
+        assert scores.loc[resume_info.metadata.reg_no].to_dict() == expected
+
+def test_rescore_with_profile(parsed_cohort, tmp_path):
+    """Test that a profile loaded from file changes the weights used."""
+    parsed_dir, raw_dir, resumes, extra_info = parsed_cohort
+    profile_file = tmp_path / "profile.json"
+    profile_file.write_text(json.dumps({"technical_weight": 50, "extra_weight": 0}))
+    
+    profile = ScoringProfile.from_file(str(profile_file))
+    scores = rescore(profile, str(parsed_dir), str(raw_dir))
+    
+    assert profile.academic_weight == 20.0
+    assert (scores["extra_score"] == 0).all()
+    for resume_info in resumes:
+        expected = calculate_candidate_score(resume_info, extra_info, profile)
+        assert scores.loc[resume_info.metadata.reg_no].to_dict() == expected
+
+def test_load_cohort_counts(parsed_cohort):
+    """Test that list sizes are recovered from the saved outputs."""
+    parsed_dir, raw_dir, resumes, extra_info = parsed_cohort
+    
+    cohort = load_cohort(str(parsed_dir), str(raw_dir))
+    
+    assert list(cohort.candidates.index) == ["06IT68", "06IT69"]
+    assert len(cohort.academic) == 2 * len(resumes[0].academic_performance)
+    assert cohort.candidates.loc["06IT69", "leadership"] == len(extra_info.leadership)
+
+def test_rescore_command(parsed_cohort, tmp_path, capsys):
+    """Test the rescore command writes a ranked CSV."""
+    parsed_dir, raw_dir, _, _ = parsed_cohort
+    output = tmp_path / "rescored.csv"
+    
+    main(["--parsed-dir", str(parsed_dir), "--raw-dir", str(raw_dir), "--output", str(output)])
+    
+    assert output.exists()
+    assert "Re-scored 2 candidates" in capsys.readouterr().out
+
+def test_rescore_from_store(tmp_path, sample_resume_info, sample_extra_info):
+    """Test re-scoring from the cohort store."""
+    from resume_parser.store import CohortStore
+    
+    store = CohortStore(tmp_path / "cohort")
+    store.add(sample_resume_info, sample_extra_info)
+    store.flush()
+    
+    scores = rescore(store_dir=str(tmp_path / "cohort"))
+    expected = calculate_candidate_score(sample_resume_info, sample_extra_info)
+    assert scores.loc["06IT68"].to_dict() == expected
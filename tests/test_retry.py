@@ -0,0 +1,90 @@
+import asyncio
+import httpx
+import openai
+import pytest
+
+from resume_parser.retry import RetryPolicy, RetryStats, call_with_retries, is_retryable, retry_after
+
+def api_error(status: int, headers: dict = None) -> openai.APIStatusError:
+    """Build an openai status error for the given HTTP status."""
+    request = httpx.Request("POST", "https://test.api.deepseek.com/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return openai.APIStatusError("error", response=response, body=None)
+
+@pytest.fixture
+def policy():
+    """Fixture to provide a fast retry policy."""
+    return RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+def test_retryable_errors():
+    """Test classification of transient and permanent failures."""
+    assert is_retryable(api_error(429))
+    assert is_retryable(api_error(503))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(api_error(400))
+    assert not is_retryable(api_error(401))
+    assert not is_retryable(ValueError())
+
+def test_retry_after_header():
+    """Test parsing of Retry-After in seconds."""
+    assert retry_after(api_error(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(api_error(429)) is None
+    assert retry_after(ValueError()) is None
+
+@pytest.mark.asyncio
+async def test_succeeds_after_transient_failures(policy):
+    """Test that transient errors are retried and counted once per resume."""
+    stats = RetryStats()
+    errors = [api_error(429), api_error(502)]
+    
+    async def attempt():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+    
+    assert await call_with_retries(attempt, policy, stats) == "ok"
+    assert (stats.retried, stats.retries, stats.failed) == (1, 2, 0)
+
+@pytest.mark.asyncio
+async def test_permanent_error_is_not_retried(policy):
+    """Test that a 4xx other than 408/409/429 fails immediately."""
+    stats = RetryStats()
+    calls = []
+    
+    async def attempt():
+        calls.append(1)
+        raise api_error(400)
+    
+    with pytest.raises(openai.APIStatusError):
+        await call_with_retries(attempt, policy, stats)
+    assert len(calls) == 1
+    assert stats.failed == 1
+
+@pytest.mark.asyncio
+async def test_retry_after_is_reported(policy):
+    """Test that the provider's requested delay is passed on."""
+    stats = RetryStats()
+    paused = []
+    errors = [api_error(429, {"retry-after": "0.01"})]
+    
+    async def attempt():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+    
+    await call_with_retries(attempt, policy, stats, on_retry_after=paused.append)
+    assert paused == [0.01]
+
+@pytest.mark.asyncio
+async def test_overall_deadline(policy):
+    """Test that a slow resume is abandoned at the overall deadline."""
+    policy.total_timeout = 0.05
+    stats = RetryStats()
+    
+    async def attempt():
+        await asyncio.sleep(1)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await call_with_retries(attempt, policy, stats)
+    assert stats.timed_out == 1
+    assert stats.failed == 1
@@ -0,0 +1,46 @@
+import asyncio
+import time
+import pytest
+
+from resume_parser.scheduler import LLMScheduler, TokenBucket, estimate_tokens
+
+@pytest.mark.asyncio
+async def test_max_in_flight_is_respected():
+    """Test that no more than max_in_flight requests run at once."""
+    scheduler = LLMScheduler(max_in_flight=3)
+    
+    async def request():
+        async with scheduler.slot():
+            assert scheduler.in_flight <= 3
+            await asyncio.sleep(0.01)
+    
+    await asyncio.gather(*(request() for _ in range(10)))
+    assert scheduler.peak_in_flight == 3
+    assert scheduler.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill():
+    """Test that an exhausted budget delays the next request."""
+    bucket = TokenBucket(capacity=2, period=0.2)
+    
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire(1)
+    
+    assert time.monotonic() - start >= 0.09
+
+@pytest.mark.asyncio
+async def test_record_usage_refunds_overestimate():
+    """Test that unused estimated tokens are returned to the budget."""
+    scheduler = LLMScheduler(tokens_per_minute=1000)
+    
+    async with scheduler.slot(800):
+        pass
+    scheduler.record_usage(800, 300)
+    
+    assert scheduler._tokens.available >= 499
+
+def test_estimate_tokens():
+    """Test rough token estimation."""
+    assert estimate_tokens("a" * 400, completion_tokens=0) == 100
+    assert estimate_tokens("a" * 400, "b" * 400) == 200 + 1024
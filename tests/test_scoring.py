@@ -6,6 +6,29 @@ from resume_parser.utils import (
     calculate_extracurricular_score,
     calculate_candidate_score
 )
+from resume_parser.models import ResumeInfo, ExtraCurricular
+from resume_parser.scoring import Cohort, score_cohort
+
+def make_candidate(make_resume_info, reg_no, gpas, companies, skills, extras):
+    """Build a parsed resume with the given semesters, projects and list sizes."""
+    skill_lists = {
+        key: [f"{key}{i}" for i in range(skills)]
+        for key in ["programming_languages", "frameworks", "databases", "other_technologies", "knowledge_area"]
+    }
+    resume_info = ResumeInfo.model_validate({
+        **make_resume_info(reg_no).model_dump(),
+        "academic_performance": [
+            {"semester": i + 1, "duration": "2021-22", "sgpa": sgpa, "cgpa": cgpa, "degree": "B.Tech"}
+            for i, (sgpa, cgpa) in enumerate(gpas)
+        ],
+        "projects": [
+            {"name": "Project", "company": company, "duration": "3 months", "skill": skill_lists}
+            for company in companies
+        ],
+        "technical_skills": skill_lists
+    })
+    extra_info = ExtraCurricular(leadership=[f"Lead {i}" for i in range(extras)], awards=["Award one two three"])
+    return resume_info, extra_info
 
 def test_academic_score_calculation():
     """Test academic score calculation."""
@@ -75,4 +98,28 @@ def test_total_score_calculation(sample_resume_info, sample_extra_info):
         scores["projects_score"] +
         scores["extra_score"]
     )
-    assert abs(total - component_sum) < 0.1, "Component scores should sum to total score" 
\ No newline at end of file
+    assert abs(total - component_sum) < 0.1, "Component scores should sum to total score"
+
+def test_cohort_scores_match_per_candidate(make_resume_info):
+    """Test that vectorised cohort scoring matches the rounded per-candidate scores."""
+    candidates = [
+        make_candidate(make_resume_info, "C0", [], [], 0, 0),
+        make_candidate(make_resume_info, "C1", [(8.7, 8.7)], ["Personal"], 1, 1),
+        make_candidate(make_resume_info, "C2", [(9.1, 9.1), (8.35, 8.72), (7.9, 8.45)], ["Infosys", "NA", "n/a"], 3, 3),
+        make_candidate(make_resume_info, "C3", [(6.0 + i * 0.37, 6.5 + i * 0.29) for i in range(9)], ["IBM"] * 12, 5, 7),
+        make_candidate(make_resume_info, "C4", [(10.0, 10.0)] * 8, ["Google"] * 2, 4, 4),
+    ]
+    
+    scores = score_cohort(Cohort.from_models(candidates))
+    
+    assert list(scores.index) == ["C0", "C1", "C2", "C3", "C4"]
+    for resume_info, extra_info in candidates:
+        expected = calculate_candidate_score(resume_info, extra_info)
+        assert scores.loc[resume_info.metadata.reg_no].to_dict() == expected
+
+def test_cohort_scores_empty_cohort():
+    """Test that an empty cohort produces an empty score table."""
+    scores = score_cohort(Cohort.from_models([]))
+    
+    assert scores.empty
+    assert "total_score" in scores.columns
@@ -0,0 +1,116 @@
+import threading
+import pandas as pd
+import pytest
+from resume_parser.models import ExtraCurricular
+from resume_parser.scoring import Cohort, score_cohort
+from resume_parser.store import CohortStore
+from resume_parser.utils import calculate_candidate_score, save_resume_data
+
+@pytest.fixture
+def extra_info():
+    """Fixture to provide extra-curricular info."""
+    return ExtraCurricular(leadership=["Team lead of the robotics club"], languages=["English"])
+
+def test_store_flushes_in_chunks(tmp_path, extra_info, make_resume_info):
+    """Test that candidates are written one part per chunk and reported once stored."""
+    store = CohortStore(tmp_path / "cohort", chunk_size=2)
+    stored = []
+    
+    for reg_no in ["A1", "A2", "A3"]:
+        store.add(make_resume_info(reg_no), extra_info, on_stored=lambda r=reg_no: stored.append(r))
+    assert stored == ["A1", "A2"]
+    assert len(list((tmp_path / "cohort" / "metadata").glob("part-*.parquet"))) == 1
+    
+    store.flush()
+    assert stored == ["A1", "A2", "A3"]
+    metadata = pd.read_parquet(tmp_path / "cohort" / "metadata")
+    assert sorted(metadata["reg_no"]) == ["A1", "A2", "A3"]
+
+def test_store_scores_match_candidate_scores(tmp_path, extra_info, make_resume_info):
+    """Test that stored scores match the per-candidate scores."""
+    store = CohortStore(tmp_path / "cohort")
+    resume_info = make_resume_info("A1", projects=3)
+    store.add(resume_info, extra_info)
+    store.flush()
+    
+    row = store.read("metadata").iloc[0]
+    for key, value in calculate_candidate_score(resume_info, extra_info).items():
+        assert row[key] == value
+
+def test_store_keeps_latest_version(tmp_path, extra_info, make_resume_info):
+    """Test that a candidate stored again replaces its earlier rows."""
+    store = CohortStore(tmp_path / "cohort")
+    store.add(make_resume_info("A1", projects=2), extra_info)
+    store.add(make_resume_info("A2", projects=1), extra_info)
+    store.flush()
+    
+    reopened = CohortStore(tmp_path / "cohort")
+    reopened.add(make_resume_info("A1", projects=0), extra_info)
+    reopened.flush()
+    
+    projects = reopened.read("projects")
+    assert list(projects["reg_no"]) == ["A2"]
+    assert len(reopened.read("metadata")) == 2
+    assert len(reopened.read("academic")) == 4
+
+def test_store_keys_candidates_by_source_id(tmp_path, extra_info, make_resume_info):
+    """Test that resumes sharing a parsed reg_no stay separate and re-adding one keeps its last version."""
+    store = CohortStore(tmp_path / "cohort")
+    store.add(make_resume_info("NA", projects=2), extra_info, source_id="page-1")
+    store.add(make_resume_info("NA", projects=1), extra_info, source_id="page-5")
+    store.add(make_resume_info("NA", projects=0), extra_info, source_id="page-1")
+    store.flush()
+    
+    metadata = store.read("metadata")
+    assert sorted(metadata["source_id"]) == ["page-1", "page-5"]
+    assert list(store.read("projects")["source_id"]) == ["page-5"]
+    
+    scores = score_cohort(store.cohort())
+    assert len(scores) == 2
+    assert list(scores.index) == ["NA", "NA"]
+
+def test_store_shared_between_threads(tmp_path, extra_info, make_resume_info):
+    """Test that writers on several threads sharing one store never reuse a part."""
+    store = CohortStore(tmp_path / "cohort", chunk_size=1)
+    
+    def add_many(prefix):
+        for i in range(10):
+            store.add(make_resume_info(f"{prefix}{i}"), extra_info, source_id=f"{prefix}{i}")
+    
+    threads = [threading.Thread(target=add_many, args=(prefix,)) for prefix in "ABCD"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(list((tmp_path / "cohort" / "metadata").glob("part-*.parquet"))) == 40
+    assert len(store.read("metadata")) == 40
+    assert len(store.read("academic")) == 80
+
+def test_store_cohort_rescoring(tmp_path, extra_info, make_resume_info):
+    """Test that the stored cohort re-scores to the same values."""
+    resumes = [make_resume_info(f"A{i}", projects=i) for i in range(4)]
+    store = CohortStore(tmp_path / "cohort", chunk_size=3)
+    for resume_info in resumes:
+        store.add(resume_info, extra_info)
+    store.flush()
+    
+    expected = score_cohort(Cohort.from_models([(r, extra_info) for r in resumes]))
+    assert score_cohort(store.cohort()).sort_index().equals(expected.sort_index())
+
+def test_store_csv_export_matches_save_resume_data(tmp_path, extra_info, make_resume_info):
+    """Test that the optional CSV export reproduces the per-candidate layout."""
+    resumes = [make_resume_info("A1", projects=2), make_resume_info("A2", projects=0)]
+    store = CohortStore(tmp_path / "cohort")
+    for resume_info in resumes:
+        store.add(resume_info, extra_info)
+        save_resume_data(resume_info, extra_info, tmp_path / "direct")
+    store.flush()
+    
+    store.export_csv(tmp_path / "exported")
+    
+    direct = sorted((tmp_path / "direct").rglob("*.csv"))
+    assert len(direct) == 10
+    for path in direct:
+        exported = tmp_path / "exported" / path.relative_to(tmp_path / "direct")
+        assert exported.read_text() == path.read_text()
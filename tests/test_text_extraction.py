@@ -0,0 +1,57 @@
+from pypdf import PdfReader
+
+from resume_parser.text_extraction import PageTextExtractor, normalize_text
+
+def test_normalize_text():
+    """Test whitespace normalisation of page text."""
+    assert normalize_text("Reg. No.      :06CO01") == "Reg. No. :06CO01"
+    assert normalize_text("single space\nkept") == "single space\nkept"
+
+def test_sequential_extraction(sample_pdfs):
+    """Test in-process extraction matches pypdf page by page."""
+    pdf = sample_pdfs[0]
+    expected = [normalize_text(p.extract_text()) for p in PdfReader(pdf).pages]
+    
+    extractor = PageTextExtractor(max_workers=1)
+    assert extractor.extract(pdf) == expected
+
+def test_sharded_extraction_preserves_order(sample_pdfs):
+    """Test that shards processed in a pool come back in page order."""
+    pdf = sample_pdfs[0]
+    expected = PageTextExtractor(max_workers=1).extract(pdf)
+    
+    extractor = PageTextExtractor(max_workers=2, pages_per_shard=1)
+    assert extractor.extract(pdf) == expected
+    assert extractor.extract(pdf.read_bytes()) == expected
+
+def test_pooled_extraction_reports_worker_cpu(sample_pdfs):
+    """Test that page CPU time is measured in the workers, not the consuming thread."""
+    pdf = sample_pdfs[0]
+    expected = PageTextExtractor(max_workers=1).extract(pdf)
+    
+    pages = list(PageTextExtractor(max_workers=2, pages_per_shard=1).iter_timed_pages(pdf))
+    assert [text for text, _ in pages] == expected
+    assert all(cpu >= 0 for _, cpu in pages)
+    assert sum(cpu for _, cpu in pages) > 0
+
+def test_file_objects_are_read_from_memory(sample_pdfs):
+    """Test that uploads given as file objects are extracted without a path."""
+    from io import BytesIO
+    pdf = sample_pdfs[0]
+    expected = PageTextExtractor(max_workers=1).extract(pdf)
+    upload = BytesIO(pdf.read_bytes())
+    upload.read()  # position left at the end, as after a previous read
+    
+    assert PageTextExtractor(max_workers=1).extract(upload) == expected
+    assert PageTextExtractor(max_workers=1, pages_per_shard=1).extract(upload) == expected
+
+def test_sharded_bytes_use_private_temp_file(sample_pdfs, tmp_path, monkeypatch):
+    """Test that pool workers read in-memory PDFs from a temp file that is removed afterwards."""
+    import tempfile
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    pdf = sample_pdfs[0]
+    
+    texts = PageTextExtractor(max_workers=2, pages_per_shard=1).extract(pdf.read_bytes())
+    
+    assert texts == PageTextExtractor(max_workers=1).extract(pdf)
+    assert list(tmp_path.iterdir()) == []
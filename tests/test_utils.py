@@ -0,0 +1,48 @@
+import pytest
+from resume_parser.utils import TokenLedger, TokenPricing, TokenUsage
+
+def make_usage(reg_no, prompt, completion, cached=0):
+    """Build a TokenUsage record."""
+    return TokenUsage(reg_no, completion, prompt, prompt + completion, cached, 0, 0)
+
+def test_ledger_summary():
+    """Test totals, cache hits, percentiles and cost."""
+    ledger = TokenLedger(pricing=TokenPricing(prompt=1.0, cached_prompt=0.5, completion=2.0))
+    ledger.record(make_usage("A", 1000, 200, cached=400))
+    ledger.record(make_usage("B", 3000, 600, cached=0))
+    ledger.record(make_usage("C", 0, 0))  # served from the extraction cache
+    
+    summary = ledger.summary()
+    assert summary['resumes'] == 3
+    assert summary['llm_calls'] == 2
+    assert summary['total_tokens'] == 4800
+    assert summary['cached_tokens'] == 400
+    assert summary['cache_hit_ratio'] == pytest.approx(0.1)
+    assert summary['p50_tokens'] == pytest.approx(2400)
+    assert summary['estimated_cost'] == pytest.approx((3600 * 1.0 + 400 * 0.5 + 800 * 2.0) / 1e6)
+
+def test_ledger_appends_batches(tmp_path):
+    """Test that flushes append only new records and batches share one file."""
+    path = tmp_path / "token_usage.jsonl"
+    first = TokenLedger(path, batch_id="first")
+    first.record(make_usage("A", 100, 10))
+    first.flush()
+    first.record(make_usage("B", 200, 20))
+    first.flush()
+    first.flush()
+    
+    second = TokenLedger(path, batch_id="second")
+    second.record(make_usage("C", 300, 30))
+    second.flush()
+    
+    records = TokenLedger.load(path)
+    assert [r['reg_no'] for r in records] == ["A", "B", "C"]
+    assert [r['batch_id'] for r in records] == ["first", "first", "second"]
+    assert second.summary(records)['total_tokens'] == 660
+
+def test_ledger_empty_summary():
+    """Test that an empty batch summarises to zeros."""
+    summary = TokenLedger().summary()
+    assert summary['resumes'] == 0
+    assert summary['p99_tokens'] == 0.0
+    assert summary['estimated_cost'] == 0.0
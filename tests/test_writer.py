@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+import pytest
+from resume_parser.models import ExtraCurricular
+from resume_parser.store import CohortStore
+from resume_parser.utils import TokenUsage
+from resume_parser.writer import ParsedResult, ResultWriter
+
+@pytest.fixture
+def make_result(make_resume_info):
+    """Fixture to provide a factory of parsed results."""
+    def make(reg_no, on_stored=None):
+        token_usage = TokenUsage(reg_no, 50, 100, 150, 0, 0, 0)
+        return ParsedResult(reg_no, make_resume_info(reg_no), ExtraCurricular(), token_usage, on_stored)
+    
+    return make
+
+@pytest.mark.asyncio
+async def test_writer_stores_results_and_flushes_on_close(tmp_path, make_result):
+    """Test that all results are written and reported on the event loop thread."""
+    store = CohortStore(tmp_path / "cohort", chunk_size=3)
+    loop_thread = threading.get_ident()
+    stored = []
+    
+    async with ResultWriter(store, raw_response_dir=tmp_path / "raw") as writer:
+        for i in range(5):
+            await writer.submit(make_result(f"R{i}", lambda i=i: stored.append((i, threading.get_ident()))))
+    
+    assert sorted(i for i, _ in stored) == list(range(5))
+    assert all(thread == loop_thread for _, thread in stored)
+    assert len(store.read("metadata")) == 5
+    assert (tmp_path / "raw" / "R4" / "llm_response.json").exists()
+    assert writer.written == 5 and writer.failed == 0
+
+@pytest.mark.asyncio
+async def test_writer_backpressure_keeps_loop_responsive(tmp_path, monkeypatch, make_result):
+    """Test that a slow disk bounds the queue without blocking the event loop."""
+    store = CohortStore(tmp_path / "cohort")
+    original_add = store.add
+    
+    def slow_add(*args, **kwargs):
+        time.sleep(0.02)
+        original_add(*args, **kwargs)
+    
+    monkeypatch.setattr(store, "add", slow_add)
+    writer = ResultWriter(store, raw_response_dir=None, max_pending=2, batch_size=2)
+    ticks = 0
+    depths = []
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+    
+    ticking = asyncio.create_task(ticker())
+    for i in range(10):
+        await writer.submit(make_result(f"R{i}"))
+        depths.append(writer._queue.qsize())
+    await writer.close()
+    ticking.cancel()
+    
+    assert max(depths) <= 2
+    assert ticks > 10
+    assert len(store.read("metadata")) == 10
+
+@pytest.mark.asyncio
+async def test_writer_counts_write_errors(tmp_path, make_result):
+    """Test that a failed write is counted and never reported as stored."""
+    blocker = tmp_path / "raw"
+    blocker.write_text("not a directory")
+    stored = []
+    
+    async with ResultWriter(CohortStore(tmp_path / "cohort"), raw_response_dir=blocker) as writer:
+        await writer.submit(make_result("R0", lambda: stored.append("R0")))
+    
+    assert writer.failed == 1
+    assert stored == []